@@ -0,0 +1,407 @@
+"""
+Benchmarks for the simulation and loading hot paths.
+
+    python benchmarks/run_benchmarks.py            # full sizes
+    python benchmarks/run_benchmarks.py --quick    # smoke run
+    python benchmarks/run_benchmarks.py --only machine
+
+Every case records best-of-N wall time, throughput and tracemalloc peak
+memory (left blank for process pool cases, whose workers tracemalloc
+cannot see), and is appended to a CSV history with the git commit so
+runs can be compared over time. The history defaults to
+benchmarks/history.csv, which is git-ignored. Workbooks and the Excel
+cache live in temporary directories that are removed after the run.
+"""
+
+import argparse
+import csv
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+
+sys.path.insert(0, str(ROOT))
+sys.path.insert(1, str(Path(__file__).resolve().parent))
+
+# Keep read_excel_cached away from the user's cache; must be set before
+# viq.Load.cache is imported. Removed when the interpreter exits.
+CACHE_TMP = tempfile.TemporaryDirectory(prefix="viq_bench_cache_")
+os.environ["VIQ_CACHE_DIR"] = CACHE_TMP.name
+
+from synthetic import (  # noqa: E402
+    synthetic_items,
+    synthetic_machine,
+    synthetic_transactions,
+    write_machine_workbooks,
+    write_sales_export
+)
+
+from viq.analysis.stats import daily_stats_table, get_month_columns  # noqa: E402
+from viq.Load.cache import read_excel_cached  # noqa: E402
+from viq.Load.sales_loader import ExcelLoader  # noqa: E402
+from viq.Load.timeseries_loader import TimeSeriesLoader  # noqa: E402
+from viq.simulation.poisson.asset_sim import ItemRestockingMonteCarlo  # noqa: E402
+from viq.simulation.day.machine_time_to_3_outs_sim import MachineTimeToThreeOutsSimulation  # noqa: E402
+from viq.simulation.day.restock_horizon_sim import RestockHorizonSimulation  # noqa: E402
+from viq.simulation.day.stats_utils import daily_stats_since_launch as weighted_stats_since_launch  # noqa: E402
+from viq.simulation.negative_binomial.asset_sim import AssetSimulation  # noqa: E402
+from viq.simulation.negative_binomial.fleet_runner import discover_machines, run_fleet  # noqa: E402
+from viq.simulation.negative_binomial.machine_sim import MachineSimulation  # noqa: E402
+from viq.simulation.negative_binomial.stats_utils import daily_stats_since_launch  # noqa: E402
+
+
+HISTORY_FIELDS = [
+    "timestamp", "commit", "python", "case", "engine", "size",
+    "seconds", "units", "units_per_second", "peak_mb"
+]
+
+# Work runs in worker processes, so a parent-side peak would be misleading
+UNTRACED_ENGINES = {"process_pool"}
+
+
+def measure(fn, repeat, trace_memory=True):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+
+    if not trace_memory:
+        return best, None
+
+    # Separate pass for memory so tracing does not skew the timing
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best, peak / 1024 ** 2
+
+
+# -----------------------------
+# CASES
+# Each yields (engine, size label, units of work, callable)
+# -----------------------------
+def poisson_cases(sizes):
+    for sims, days in sizes["sims_days"]:
+        mc = ItemRestockingMonteCarlo(
+            item_name="bench",
+            average_daily_sales=2.6,
+            days_between_visits=days,
+            lead_time_days=2,
+            par_level=int(2.6 * days * 1.3),
+            number_of_simulations=sims,
+            rng=0
+        )
+        label = f"sims={sims} days={days}"
+        work = sims * days
+
+        if sims <= sizes["loop_limit"]:
+            yield "loop", label, work, mc.sim
+        yield "vectorized", label, work, mc.sim_vectorized
+        yield "analytic", label, work, mc.analytic
+
+
+def asset_cases(sizes):
+    for sims, days in sizes["sims_days"]:
+        sim = AssetSimulation(
+            item_name="bench",
+            avg_daily_sales=2.0,
+            daily_std=2.5,
+            days_between_visits=days,
+            lead_time_days=2,
+            par_level=int(2.0 * days * 1.3),
+            number_of_simulations=sims,
+            rng=0
+        )
+        label = f"sims={sims} days={days}"
+        work = sims * days
+
+        if sims <= sizes["loop_limit"]:
+            yield "loop", label, work, sim.run
+        yield "batched", label, work, sim.run_batched
+        yield "analytic", label, work, sim.analytic
+
+
+def machine_cases(sizes):
+    for n_items, sims in sizes["items_sims"]:
+        items = synthetic_items(n_items, seed=1)
+        sim = MachineSimulation(
+            item_names=items["Item Name"].values,
+            avg_daily_sales=items["avg_daily_sales"].values,
+            daily_std=items["daily_std"].values,
+            par_levels=items["par_level"].values,
+            capacities=items["capacity"].values,
+            days_between_visits=20,
+            lead_time_days=2,
+            number_of_simulations=sims,
+            rng=0
+        )
+        label = f"items={n_items} sims={sims}"
+        yield "machine", label, n_items * sims, sim.run
+
+        if n_items * sims <= sizes["per_item_limit"]:
+            def per_item(items=items, sims=sims):
+                for row in items.itertuples(index=False):
+                    AssetSimulation(
+                        item_name=row[0],
+                        avg_daily_sales=row.avg_daily_sales,
+                        daily_std=row.daily_std,
+                        days_between_visits=20,
+                        lead_time_days=2,
+                        par_level=row.par_level,
+                        number_of_simulations=sims,
+                        rng=0
+                    ).run_batched()
+
+            yield "per_item_batched", label, n_items * sims, per_item
+
+
+def three_outs_cases(sizes):
+    for n_items, sims in sizes["three_outs"]:
+        items = synthetic_items(n_items, seed=2)
+        sim = MachineTimeToThreeOutsSimulation(
+            items=[
+                {
+                    "item_name": row[0],
+                    "avg_daily_sales": row.avg_daily_sales,
+                    "daily_std": row.daily_std,
+                    "par_level": row.par_level
+                }
+                for row in items.itertuples(index=False)
+            ],
+            number_of_simulations=sims,
+            rng=0
+        )
+        label = f"items={n_items} sims={sims}"
+
+        if sims <= sizes["loop_limit"]:
+            yield "loop", label, n_items * sims, sim.run
+        yield "batched", label, n_items * sims, sim.run_batched
+
+
+def horizon_cases(sizes):
+    for n_items, sims, days in sizes["horizon"]:
+        items = synthetic_items(n_items, seed=4)
+        sim = RestockHorizonSimulation(
+            items=[
+                {
+                    "item_name": row[0],
+                    "avg_daily_sales": row.avg_daily_sales,
+                    "daily_std": row.daily_std,
+                    "par_level": row.par_level
+                }
+                for row in items.itertuples(index=False)
+            ],
+            number_of_simulations=sims,
+            visit_schedule=7,
+            lead_time_days=1,
+            horizon_days=days,
+            rng=0
+        )
+        label = f"items={n_items} sims={sims} days={days}"
+        yield "batched", label, n_items * sims * days, sim.run
+
+
+def stats_cases(sizes):
+    for n_items, n_months in sizes["stats"]:
+        df_sales, _ = synthetic_machine(n_items, n_months, seed=3)
+        month_columns = get_month_columns(df_sales)
+        label = f"items={n_items} months={n_months}"
+
+        def per_row(df_sales=df_sales, month_columns=month_columns, stats=daily_stats_since_launch):
+            for _, row in df_sales.iterrows():
+                stats(row, month_columns, 30)
+
+        if n_items <= sizes["per_row_limit"]:
+            yield "per_row", label, n_items * n_months, per_row
+            yield "per_row_weighted", label, n_items * n_months, (
+                lambda per_row=per_row: per_row(stats=weighted_stats_since_launch)
+            )
+        yield "table", label, n_items * n_months, (
+            lambda df=df_sales, cols=month_columns: daily_stats_table(df, cols, 30)
+        )
+
+
+def loader_cases(sizes):
+    with tempfile.TemporaryDirectory(prefix="viq_bench_") as tmp:
+        for n_items, n_months in sizes["loaders"]:
+            sales_path, _ = write_machine_workbooks(tmp, f"m{n_items}", n_items, n_months)
+            label = f"items={n_items} months={n_months}"
+
+            yield "read_excel", label, n_items, (
+                lambda p=sales_path: pd.read_excel(p, header=12)
+            )
+
+            read_excel_cached(sales_path, cache_dir=tmp, header=12)
+            yield "cached", label, n_items, (
+                lambda p=sales_path: read_excel_cached(p, cache_dir=tmp, header=12)
+            )
+
+            # ExcelLoader goes through the default cache (CACHE_TMP)
+            export_path = write_sales_export(tmp, f"e{n_items}", n_items, n_months)
+            ExcelLoader(export_path).load()
+            yield "excel_loader", label, n_items, ExcelLoader(export_path).load
+
+
+def timeseries_cases(sizes):
+    with tempfile.TemporaryDirectory(prefix="viq_bench_ts_") as tmp:
+        for n_rows in sizes["timeseries"]:
+            df = synthetic_transactions(n_rows, seed=5)
+            label = f"rows={n_rows}"
+
+            csv_path = Path(tmp) / f"t{n_rows}.csv"
+            parquet_path = Path(tmp) / f"t{n_rows}.parquet"
+            df.to_csv(csv_path, index=False)
+            df.to_parquet(parquet_path, index=False)
+
+            for fmt, path in (("csv", csv_path), ("parquet", parquet_path)):
+                loader = TimeSeriesLoader(path, chunk_size=sizes["chunk_size"])
+
+                yield f"{fmt}_load", label, n_rows, loader.load
+                yield f"{fmt}_daily", label, n_rows, (
+                    lambda loader=loader: loader.daily(by=["Asset ID"])
+                )
+
+
+def fleet_cases(sizes):
+    for n_machines, n_items, workers in sizes["fleet"]:
+        with tempfile.TemporaryDirectory(prefix="viq_bench_fleet_") as tmp:
+            for m in range(n_machines):
+                write_machine_workbooks(tmp, f"{m:05d}", n_items, 24, seed=m)
+
+            pairs = discover_machines(tmp)
+            label = f"machines={n_machines} items={n_items} workers={workers}"
+
+            # Warm the Excel cache so the pool time is simulation time
+            run_fleet(pairs, number_of_simulations=10, max_workers=workers, cache_dir=tmp)
+
+            yield "process_pool", label, n_machines * n_items * 10_000, (
+                lambda pairs=pairs, workers=workers, tmp=tmp: run_fleet(
+                    pairs,
+                    number_of_simulations=10_000,
+                    max_workers=workers,
+                    seed=0,
+                    cache_dir=tmp
+                )
+            )
+
+
+CASES = {
+    "poisson": poisson_cases,
+    "asset": asset_cases,
+    "machine": machine_cases,
+    "three_outs": three_outs_cases,
+    "horizon": horizon_cases,
+    "stats": stats_cases,
+    "loaders": loader_cases,
+    "timeseries": timeseries_cases,
+    "fleet": fleet_cases
+}
+
+FULL_SIZES = {
+    "sims_days": [(1_000, 3), (10_000, 3), (10_000, 20), (100_000, 20)],
+    "items_sims": [(10, 10_000), (60, 10_000), (200, 10_000), (60, 100_000)],
+    "three_outs": [(40, 1_000), (60, 10_000)],
+    "horizon": [(60, 1_000, 360), (60, 10_000, 90)],
+    "stats": [(60, 24), (1_000, 36), (20_000, 36)],
+    "loaders": [(60, 24), (500, 36)],
+    "timeseries": [100_000, 2_000_000],
+    "chunk_size": 500_000,
+    "fleet": [(16, 60, 1), (16, 60, 4), (64, 60, 8)],
+    "loop_limit": 10_000,
+    "per_item_limit": 1_000_000,
+    "per_row_limit": 1_000
+}
+
+QUICK_SIZES = {
+    "sims_days": [(1_000, 3), (1_000, 20)],
+    "items_sims": [(10, 1_000), (60, 1_000)],
+    "three_outs": [(20, 200)],
+    "horizon": [(20, 200, 60)],
+    "stats": [(60, 24)],
+    "loaders": [(30, 12)],
+    "timeseries": [20_000],
+    "chunk_size": 5_000,
+    "fleet": [(4, 20, 2)],
+    "loop_limit": 1_000,
+    "per_item_limit": 100_000,
+    "per_row_limit": 100
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--only", nargs="*", choices=sorted(CASES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--history",
+        default=str(Path(__file__).resolve().parent / "history.csv")
+    )
+    args = parser.parse_args()
+
+    sizes = QUICK_SIZES if args.quick else FULL_SIZES
+    meta = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version()
+    }
+
+    rows = []
+
+    for case in args.only or CASES:
+        for engine, label, units, fn in CASES[case](sizes):
+            seconds, peak_mb = measure(
+                fn, args.repeat, trace_memory=engine not in UNTRACED_ENGINES
+            )
+            memory = f"{peak_mb:.2f}" if peak_mb is not None else ""
+
+            rows.append({
+                **meta,
+                "case": case,
+                "engine": engine,
+                "size": label,
+                "seconds": f"{seconds:.6f}",
+                "units": units,
+                "units_per_second": f"{units / seconds:.1f}",
+                "peak_mb": memory
+            })
+
+            print(
+                f"{case:<11} {engine:<17} {label:<24} "
+                f"{seconds * 1000:>10.2f} ms  {units / seconds:>14,.0f}/s  "
+                + (f"{peak_mb:>8.2f} MB" if peak_mb is not None else f"{'n/a':>8}")
+            )
+
+    history = Path(args.history)
+    write_header = not history.exists()
+
+    with open(history, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=HISTORY_FIELDS)
+        if write_header:
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
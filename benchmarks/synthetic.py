@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+
+def month_labels(n_months, start_year=2023):
+    return [
+        f"{m % 12 + 1:02d}/{start_year + m // 12}"
+        for m in range(n_months)
+    ]
+
+
+def synthetic_items(
+    n_items,
+    mean_range=(0.1, 4.0),
+    dispersion_range=(0.8, 2.5),
+    par_days_range=(5, 25),
+    seed=0
+):
+    """
+    Item table as arrays: daily mean uniform in mean_range, std as a
+    multiple of sqrt(mean) (below 1 -> Poisson, above -> negative
+    binomial), par covering par_days_range days of demand and capacity
+    25-100% above par.
+    """
+    rng = np.random.default_rng(seed)
+
+    means = rng.uniform(*mean_range, size=n_items)
+    stds = np.sqrt(means) * rng.uniform(*dispersion_range, size=n_items)
+    pars = np.maximum(
+        np.round(means * rng.uniform(*par_days_range, size=n_items)), 1
+    ).astype(int)
+    capacities = np.round(pars * rng.uniform(1.25, 2.0, size=n_items)).astype(int)
+
+    return pd.DataFrame({
+        "Item Name": [f"Item {i:04d}" for i in range(n_items)],
+        "avg_daily_sales": means,
+        "daily_std": stds,
+        "par_level": pars,
+        "capacity": capacities
+    })
+
+
+def synthetic_machine(
+    n_items,
+    n_months,
+    days_per_month=30,
+    launch_fraction=0.3,
+    seed=0,
+    **item_kwargs
+):
+    """
+    (df_sales, df_par) shaped like the sales / par exports: Item Name plus
+    one MM/YYYY column per month, and Item Name / MM Par / Capacity.
+    launch_fraction of the items launch part-way through the history.
+    """
+    rng = np.random.default_rng(seed)
+    items = synthetic_items(n_items, seed=seed, **item_kwargs)
+
+    # Monthly totals of negative binomial daily demand (Poisson when
+    # var <= mean), like the simulators assume
+    mean = items["avg_daily_sales"].to_numpy() * days_per_month
+    var = (items["daily_std"].to_numpy() ** 2) * days_per_month
+    r = np.where(var > mean, mean ** 2 / np.maximum(var - mean, 1e-9), np.inf)
+
+    negbin = np.isfinite(r)
+    n = np.where(negbin, r, 1.0)
+    p = np.where(negbin, n / (n + mean), 0.5)
+
+    monthly = np.where(
+        negbin[:, None],
+        rng.negative_binomial(n[:, None], p[:, None], size=(n_items, n_months)),
+        rng.poisson(mean[:, None], size=(n_items, n_months))
+    )
+
+    launched_late = rng.random(n_items) < launch_fraction
+    launch = np.where(launched_late, rng.integers(0, n_months, n_items), 0)
+    monthly[np.arange(n_months)[None, :] < launch[:, None]] = 0
+
+    df_sales = pd.DataFrame(monthly, columns=month_labels(n_months))
+    df_sales.insert(0, "Item Name", items["Item Name"])
+
+    df_par = pd.DataFrame({
+        "Item Name": items["Item Name"],
+        "MM Par": items["par_level"],
+        "Capacity": items["capacity"]
+    })
+
+    return df_sales, df_par
+
+
+def synthetic_transactions(n_rows, n_machines=10, n_items=60, days=365, seed=0):
+    """
+    Per-vend rows like the timeseries export.
+    """
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2025-01-01T00:00:00")
+
+    slot_rows = np.array(list("ABCDEF"))
+
+    return pd.DataFrame({
+        "Asset ID": rng.integers(1, n_machines + 1, n_rows),
+        "Item": np.char.add("Item ", rng.integers(0, n_items, n_rows).astype(str)),
+        "Selection": np.char.add(
+            slot_rows[rng.integers(0, len(slot_rows), n_rows)],
+            rng.integers(1, 11, n_rows).astype(str)
+        ),
+        "Sale Time": start + rng.integers(0, days * 86_400, n_rows).astype("timedelta64[s]"),
+        "Quantity": rng.integers(1, 3, n_rows),
+        "Price": rng.choice([1.25, 1.5, 2.0, 2.5], n_rows)
+    })
+
+
+def write_machine_workbooks(directory, machine_id, n_items, n_months, seed=0):
+    """
+    Writes <machine_id>.xlsx / <machine_id>_par.xlsx with the 12 junk
+    rows the real exports carry above the header.
+    """
+    df_sales, df_par = synthetic_machine(n_items, n_months, seed=seed)
+
+    sales_path = f"{directory}/{machine_id}.xlsx"
+    par_path = f"{directory}/{machine_id}_par.xlsx"
+
+    with pd.ExcelWriter(sales_path) as writer:
+        df_sales.to_excel(writer, startrow=12, index=False)
+
+    with pd.ExcelWriter(par_path) as writer:
+        df_par.to_excel(writer, startrow=12, index=False)
+
+    return sales_path, par_path
+
+
+def write_sales_export(directory, name, n_items, n_months, seed=0):
+    """
+    Writes <name>.xlsx laid out the way ExcelLoader expects: the header
+    on row 12, a leading index column and 10 filler rows above the items.
+    """
+    df_sales, _ = synthetic_machine(n_items, n_months, seed=seed)
+
+    filler = pd.DataFrame(np.nan, index=range(10), columns=df_sales.columns)
+    df = pd.concat([filler, df_sales], ignore_index=True)
+    df.insert(0, "Row", range(len(df)))
+
+    path = f"{directory}/{name}.xlsx"
+    with pd.ExcelWriter(path) as writer:
+        df.to_excel(writer, startrow=11, index=False)
+
+    return path
@@ -1,23 +1,127 @@
 # sim_risk_plot.py
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
+import pyarrow.parquet as pq
+
+
+RISK_BINS = [-0.01, 0.05, 0.15, 1.0]
+RISK_TIERS = ["Low Risk", "Medium Risk", "High Risk"]
+
+SUMMARY_COLUMNS = [
+    "q1", "median", "q3", "lower_fence", "upper_fence", "p95",
+    "Stockout Probability"
+]
+
+
+def box_summary(demand, par):
+    """
+    Box plot statistics for one item's samples, matching
+    SimulationResults.quantile_summary. Stockout Probability is
+    P(demand > par), the same definition as the raw-sample mode.
+    """
+    demand = np.asarray(demand)
+    q1, median, q3, p95 = np.quantile(demand, [0.25, 0.5, 0.75, 0.95])
+    iqr = q3 - q1
+
+    return {
+        "q1": q1,
+        "median": median,
+        "q3": q3,
+        "lower_fence": demand[demand >= q1 - 1.5 * iqr].min(),
+        "upper_fence": demand[demand <= q3 + 1.5 * iqr].max(),
+        "p95": p95,
+        "Stockout Probability": np.mean(demand > par)
+    }
 
 
 class SimulationRiskBoxPlot:
+    """
+    Cycle demand box plot per item, ordered by p95 and coloured by
+    stockout risk, with each item's par drawn as a dashed line.
+
+    Built either from raw samples (one row per simulation) or, with
+    summary, from one row per item of precomputed statistics (see
+    SUMMARY_COLUMNS, e.g. SimulationResults.quantile_summary()), which
+    keeps memory and render time O(items).
+    """
+
     def __init__(
         self,
-        df: pd.DataFrame,
+        df: pd.DataFrame = None,
         item_col: str = "Item Name",
         demand_col: str = "Cycle Demand",
         par_col: str = "Par Level",
+        summary: pd.DataFrame = None
     ):
-        self.df = df.copy()
         self.item_col = item_col
         self.demand_col = demand_col
         self.par_col = par_col
 
-        self._prepare_data()
+        if summary is not None:
+            self.df = None
+            self._prepare_summary(summary)
+        else:
+            self.df = df.copy()
+            self.summary = None
+            self._prepare_data()
+
+    @classmethod
+    def from_summary(cls, summary, **kwargs):
+        return cls(summary=summary, **kwargs)
+
+    @classmethod
+    def from_parquet(cls, path, items=None, summary=False, **kwargs):
+        """
+        Builds the plot from a SimulatedSalesWriter export, reading only
+        the requested items' row groups. With summary, items are reduced
+        to box statistics one row group at a time instead of loading
+        every sample.
+        """
+        item_col = kwargs.get("item_col", "Item Name")
+
+        if not summary:
+            filters = None
+            if items is not None:
+                filters = [(item_col, "in", list(items))]
+
+            return cls(pd.read_parquet(path, filters=filters), **kwargs)
+
+        demand_col = kwargs.get("demand_col", "Cycle Demand")
+        par_col = kwargs.get("par_col", "Par Level")
+        wanted = set(items) if items is not None else None
+
+        # An item's row groups are written back to back, so each item is
+        # summarised as soon as the next one starts
+        parquet_file = pq.ParquetFile(path)
+        rows = []
+        current, chunks, par = None, [], None
+
+        def flush():
+            if chunks:
+                rows.append({
+                    item_col: current,
+                    par_col: par,
+                    **box_summary(np.concatenate(chunks), par)
+                })
+
+        for i in range(parquet_file.num_row_groups):
+            table = parquet_file.read_row_group(i, columns=[item_col, demand_col, par_col])
+            item = table.column(item_col)[0].as_py()
+
+            if item != current:
+                flush()
+                current, chunks = item, []
+
+            if wanted is None or item in wanted:
+                chunks.append(table.column(demand_col).to_numpy())
+                par = table.column(par_col)[0].as_py()
+
+        flush()
+
+        return cls(summary=pd.DataFrame(rows), **kwargs)
 
     def _prepare_data(self):
         self.p95 = (
@@ -46,8 +150,8 @@ class SimulationRiskBoxPlot:
 
         self.df["Risk Tier"] = pd.cut(
             self.df["Stockout Probability"],
-            bins=[-0.01, 0.05, 0.15, 1.0],
-            labels=["Low Risk", "Medium Risk", "High Risk"]
+            bins=RISK_BINS,
+            labels=RISK_TIERS
         )
 
         self.par_lookup = (
@@ -55,8 +159,25 @@ class SimulationRiskBoxPlot:
             .first()
         )
 
-    def plot(self):
-        fig = px.box(
+    def _prepare_summary(self, summary):
+        missing = set(SUMMARY_COLUMNS + [self.item_col, self.par_col]) - set(summary.columns)
+        if missing:
+            raise ValueError(f"Missing required columns: {sorted(missing)}")
+
+        self.summary = summary.sort_values("p95").set_index(self.item_col)
+        self.summary["Risk Tier"] = pd.cut(
+            self.summary["Stockout Probability"],
+            bins=RISK_BINS,
+            labels=RISK_TIERS
+        )
+
+        self.p95 = self.summary["p95"]
+        self.p95_order = self.summary.index
+        self.stockout_prob = self.summary["Stockout Probability"]
+        self.par_lookup = self.summary[self.par_col]
+
+    def _raw_figure(self):
+        return px.box(
             self.df,
             x=self.item_col,
             y=self.demand_col,
@@ -65,6 +186,47 @@ class SimulationRiskBoxPlot:
             category_orders={self.item_col: list(self.p95_order)},
         )
 
+    def _summary_figure(self):
+        fig = go.Figure()
+
+        for tier, group in self.summary.groupby("Risk Tier", observed=True):
+            fig.add_trace(
+                go.Box(
+                    name=tier,
+                    x=group.index,
+                    q1=group["q1"],
+                    median=group["median"],
+                    q3=group["q3"],
+                    lowerfence=group["lower_fence"],
+                    upperfence=group["upper_fence"]
+                )
+            )
+
+        fig.add_trace(
+            go.Scatter(
+                x=self.summary.index,
+                y=self.summary["p95"],
+                mode="markers",
+                name="P95",
+                marker=dict(symbol="diamond", size=6, color="black")
+            )
+        )
+
+        fig.update_layout(
+            boxmode="overlay",
+            xaxis=dict(categoryorder="array", categoryarray=list(self.p95_order)),
+            xaxis_title=self.item_col,
+            yaxis_title=self.demand_col
+        )
+
+        return fig
+
+    def plot(self):
+        if self.summary is not None:
+            fig = self._summary_figure()
+        else:
+            fig = self._raw_figure()
+
         for i, item in enumerate(self.p95_order):
             fig.add_shape(
                 type="line",
@@ -84,10 +246,9 @@ class SimulationRiskBoxPlot:
 # -------------------------------------------------
 if __name__ == "__main__":
 
-    df = pd.read_csv(
-        "/Users/andrewleacock1/Downloads/simulated_sales_255.csv"
+    plotter = SimulationRiskBoxPlot.from_parquet(
+        "/Users/andrewleacock1/Downloads/simulated_sales_255.parquet",
+        summary=True
     )
-
-    plotter = SimulationRiskBoxPlot(df)
     fig = plotter.plot()
     fig.show()
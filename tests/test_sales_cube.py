@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from viq.analysis.sales_cube import SalesCube
+from viq.Load.timeseries_loader import TimeSeriesLoader
+
+
+def vend_log(prices=True):
+    df = pd.DataFrame({
+        "Sale Time": [
+            "2024-01-01 08:00", "2024-01-01 12:00",
+            "2024-01-02 09:00", "2024-01-02 10:00"
+        ],
+        "Asset ID": [101, 101, 101, 202],
+        "Item": ["Chips", "Chips", "Soda", "Chips"],
+        "Quantity": [1, 2, 1, 3]
+    })
+    if prices:
+        df["Price"] = [1.5, 1.5, 2.0, 1.5]
+    return df
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".xlsx"])
+def test_from_loader_without_prices(tmp_path, suffix):
+    path = tmp_path / f"vends{suffix}"
+    df = vend_log(prices=False)
+
+    if suffix == ".csv":
+        df.to_csv(path, index=False)
+    elif suffix == ".parquet":
+        df.to_parquet(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+
+    cube = SalesCube.from_loader(TimeSeriesLoader(path, chunk_size=2))
+
+    assert cube.df["Quantity"].sum() == 7
+    assert cube.df["Revenue"].isna().all()
+    assert len(cube.df) == 3
+
+
+def test_from_loader_with_prices(tmp_path):
+    path = tmp_path / "vends.csv"
+    vend_log().to_csv(path, index=False)
+
+    cube = SalesCube.from_loader(TimeSeriesLoader(path, chunk_size=2))
+    totals = cube.item_totals().set_index("Item")
+
+    assert totals.loc["Chips", "Quantity"] == 6
+    assert totals.loc["Chips", "Revenue"] == pytest.approx(9.0)
+    assert totals.loc["Soda", "Revenue"] == pytest.approx(2.0)
@@ -1,5 +1,8 @@
-from viq.load.timeseries_loader import TimeSeriesLoader
+from viq.Load.cache import read_excel_cached, clear_cache
+from viq.Load.timeseries_loader import TimeSeriesLoader
 
 __all__ = [
-    "TimeSeriesLoader"
+    "TimeSeriesLoader",
+    "read_excel_cached",
+    "clear_cache"
 ]
\ No newline at end of file
@@ -0,0 +1,134 @@
+import hashlib
+import os
+import pickle
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+
+
+CACHE_DIR = Path(
+    os.environ.get("VIQ_CACHE_DIR", Path.home() / ".cache" / "viq")
+)
+MAX_CACHE_BYTES = 2 * 1024 ** 3
+# Evict by size only; a fleet run caches two workbooks per machine, so
+# any entry cap small enough to matter would defeat the cache
+MAX_CACHE_ENTRIES = None
+
+
+def _cache_key(file_path: Path, read_kwargs: dict, content_hash: bool) -> str:
+    stat = file_path.stat()
+
+    h = hashlib.sha256()
+    h.update(str(file_path.resolve()).encode())
+    h.update(str(stat.st_size).encode())
+
+    if content_hash:
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+    else:
+        h.update(str(stat.st_mtime_ns).encode())
+
+    h.update(repr(sorted(read_kwargs.items())).encode())
+    return h.hexdigest()
+
+
+def _store(df: pd.DataFrame, base: Path):
+    # Feather (uncompressed, so reads can be memory-mapped) when Arrow can
+    # represent the frame; mixed-type Excel columns and non-string headers
+    # (which Arrow would stringify) fall back to pickle.
+    tmp = base.with_suffix(".tmp")
+
+    try:
+        if not all(isinstance(c, str) for c in df.columns):
+            raise TypeError("Feather requires string column names")
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        feather.write_feather(table, tmp, compression="uncompressed")
+        os.replace(tmp, base.with_suffix(".feather"))
+
+    except (pa.ArrowException, TypeError, ValueError):
+        with open(tmp, "wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, base.with_suffix(".pkl"))
+
+
+def _evict(cache_dir: Path, max_bytes: int, max_entries=None):
+    # Least recently used first; hits touch the file's mtime. Other
+    # processes (run_fleet workers) may delete entries mid-scan.
+    entries = []
+    for p in cache_dir.iterdir():
+        if p.suffix not in (".feather", ".pkl"):
+            continue
+        try:
+            stat = p.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, p))
+
+    entries.sort(key=lambda e: e[0])
+    total = sum(size for _, size, _ in entries)
+
+    while entries and (
+        total > max_bytes
+        or (max_entries is not None and len(entries) > max_entries)
+    ):
+        _, size, oldest = entries.pop(0)
+        total -= size
+        oldest.unlink(missing_ok=True)
+
+
+def read_excel_cached(
+    file_path,
+    cache_dir=None,
+    content_hash=False,
+    max_bytes=MAX_CACHE_BYTES,
+    max_entries=MAX_CACHE_ENTRIES,
+    **read_kwargs
+) -> pd.DataFrame:
+    """
+    pd.read_excel with a columnar on-disk cache.
+
+    Entries are keyed on path + size + mtime (or a hash of the file
+    contents with content_hash=True) + the read_excel arguments, so an
+    edited workbook is re-parsed automatically.
+    """
+    file_path = Path(file_path)
+    cache_dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    base = cache_dir / _cache_key(file_path, read_kwargs, content_hash)
+
+    for path in (base.with_suffix(".feather"), base.with_suffix(".pkl")):
+        # Another process may evict the entry at any point; treat that as
+        # a miss
+        try:
+            os.utime(path)
+
+            if path.suffix == ".feather":
+                return feather.read_feather(path, memory_map=True)
+
+            with open(path, "rb") as f:
+                return pickle.load(f)
+
+        except FileNotFoundError:
+            continue
+
+    df = pd.read_excel(file_path, **read_kwargs)
+
+    _store(df, base)
+    _evict(cache_dir, max_bytes, max_entries)
+
+    return df
+
+
+def clear_cache(cache_dir=None):
+    cache_dir = Path(cache_dir) if cache_dir is not None else CACHE_DIR
+    if not cache_dir.exists():
+        return
+
+    for p in cache_dir.iterdir():
+        if p.suffix in (".feather", ".pkl", ".tmp"):
+            p.unlink(missing_ok=True)
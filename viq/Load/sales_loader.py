@@ -1,6 +1,8 @@
 from pathlib import Path
 import pandas as pd
 
+from viq.Load.cache import read_excel_cached
+
 
 class ExcelLoader:
     def __init__(self, file_path: str):
@@ -12,7 +14,7 @@ class ExcelLoader:
                 raise FileNotFoundError
 
             # Cuts out those annoying rows given by Excel exports
-            df = pd.read_excel(self.file_path, header=11)
+            df = read_excel_cached(self.file_path, header=11)
             df = df.iloc[:, 1:]
             df = df.iloc[10:, :]
             df = df[~df.iloc[:, 0].str.startswith("zz", na=False)]
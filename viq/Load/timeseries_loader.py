@@ -1,24 +1,178 @@
+from pathlib import Path
+
 import pandas as pd
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+
+from viq.Load.cache import read_excel_cached
+
+
+WEEKDAYS = pd.CategoricalDtype(
+    ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"],
+    ordered=True
+)
 
 
 class TimeSeriesLoader:
-    def __init__(self, filepath):
-        self.filepath = filepath
+    """
+    Per-vend transaction loader for .xlsx, .csv and .parquet exports.
+
+    load() returns the whole log with compact dtypes: Sale Time as
+    datetime64, Quantity as int32, Day (Sale Time floored to the day) and
+    Day_of_Week as an ordered categorical. For logs too big for memory,
+    iter_chunks() streams the same frames chunk_size rows at a time and
+    daily() aggregates to one row per day without holding the log.
+    """
+
+    def __init__(self, filepath, chunk_size=500_000):
+        self.filepath = Path(filepath)
+        self.chunk_size = chunk_size
+
+    def _iter_raw(self, columns=None):
+        suffix = self.filepath.suffix.lower()
+
+        if suffix == ".csv":
+            yield from pd.read_csv(
+                self.filepath, usecols=columns, chunksize=self.chunk_size
+            )
+
+        elif suffix == ".parquet":
+            parquet_file = pq.ParquetFile(self.filepath)
+            for batch in parquet_file.iter_batches(
+                batch_size=self.chunk_size, columns=columns
+            ):
+                yield batch.to_pandas()
+
+        elif suffix in (".xlsx", ".xlsm"):
+            # Read-only mode streams rows instead of building the workbook
+            workbook = load_workbook(self.filepath, read_only=True, data_only=True)
+            try:
+                rows = workbook.active.iter_rows(values_only=True)
+                header = list(next(rows))
+
+                chunk = []
+                for row in rows:
+                    chunk.append(row)
+                    if len(chunk) == self.chunk_size:
+                        yield self._frame(chunk, header, columns)
+                        chunk = []
+
+                if chunk:
+                    yield self._frame(chunk, header, columns)
+            finally:
+                workbook.close()
+
+        else:
+            raise ValueError(f"Unsupported transaction file: {self.filepath}")
+
+    def header(self):
+        """
+        Column names of the export, without reading any rows.
+        """
+        suffix = self.filepath.suffix.lower()
+
+        if suffix == ".csv":
+            return list(pd.read_csv(self.filepath, nrows=0).columns)
 
-    def load(self):
-        df = pd.read_excel(self.filepath)
+        if suffix == ".parquet":
+            return pq.ParquetFile(self.filepath).schema_arrow.names
+
+        if suffix in (".xlsx", ".xlsm"):
+            workbook = load_workbook(self.filepath, read_only=True, data_only=True)
+            try:
+                return list(next(workbook.active.iter_rows(values_only=True), ()))
+            finally:
+                workbook.close()
+
+        raise ValueError(f"Unsupported transaction file: {self.filepath}")
+
+    @staticmethod
+    def _frame(rows, header, columns):
+        df = pd.DataFrame.from_records(rows, columns=header)
+        return df[columns] if columns is not None else df
+
+    @staticmethod
+    def _compact(df):
+        missing = {"Sale Time", "Quantity"} - set(df.columns)
+        if missing:
+            raise ValueError(f"Missing required columns: {sorted(missing)}")
 
         df["Sale Time"] = pd.to_datetime(df["Sale Time"])
-        df["Quantity"] = pd.to_numeric(df["Quantity"])
+        df["Quantity"] = (
+            pd.to_numeric(df["Quantity"], errors="coerce")
+            .fillna(0)
+            .astype("int32")
+        )
 
-        df["Date"] = df["Sale Time"]
-        df["Day_of_Week"] = df["Sale Time"].dt.day_name()
+        df["Day_of_Week"] = df["Sale Time"].dt.day_name().astype(WEEKDAYS)
         df["Day"] = df["Sale Time"].dt.floor("D")
 
         return df
 
+    def iter_chunks(self, columns=None):
+        """
+        Yields compact frames of at most chunk_size rows. columns limits
+        which export columns are read (Sale Time and Quantity are always
+        included).
+        """
+        if columns is not None:
+            columns = list(dict.fromkeys(["Sale Time", "Quantity", *columns]))
+
+        for chunk in self._iter_raw(columns):
+            yield self._compact(chunk)
+
+    def iter_daily(self, by=None, columns=None):
+        """
+        Yields each chunk pre-aggregated to Day (plus `by` columns) with
+        summed Quantity and any extra numeric `columns`. A day that spans
+        two chunks appears in both; daily() combines them.
+        """
+        keys = ["Day", *(by or [])]
+        values = ["Quantity", *(columns or [])]
+
+        for chunk in self.iter_chunks(columns=keys[1:] + values[1:]):
+            yield (
+                chunk
+                .groupby(keys, observed=True, sort=False)[values]
+                .sum()
+                .reset_index()
+            )
+
+    def daily(self, by=None, columns=None) -> pd.DataFrame:
+        """
+        One row per Day (and `by` group) with Day_of_Week and summed
+        Quantity, streamed chunk by chunk.
+        """
+        keys = ["Day", *(by or [])]
+        values = ["Quantity", *(columns or [])]
+
+        partials = list(self.iter_daily(by=by, columns=columns))
+        if not partials:
+            return pd.DataFrame(columns=keys + ["Day_of_Week"] + values)
+
+        daily = (
+            pd.concat(partials, ignore_index=True)
+            .groupby(keys, observed=True)[values]
+            .sum()
+            .reset_index()
+        )
+        daily["Quantity"] = daily["Quantity"].astype("int32")
+        daily.insert(
+            len(keys), "Day_of_Week", daily["Day"].dt.day_name().astype(WEEKDAYS)
+        )
+
+        return daily
+
+    def load(self) -> pd.DataFrame:
+        if self.filepath.suffix.lower() in (".xlsx", ".xlsm", ".xls"):
+            return self._compact(read_excel_cached(self.filepath))
+
+        chunks = list(self.iter_chunks())
+        return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
 
 if __name__ == "__main__":
     loader = TimeSeriesLoader("/Users/drewski/Downloads/timeseries.xlsx")
     df = loader.load()
     print(df.head())
+    print(loader.daily().head())
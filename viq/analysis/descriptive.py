@@ -1,50 +1,158 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
 import pandas as pd
 
+from viq.Load.cache import read_excel_cached
+
+
+def summarize_sales(df: pd.DataFrame, report="report", n_top: int = 5):
+    """
+    All report metrics from a single aggregation over the raw rows
+    (date, product, total_sales). Everything else is derived from the
+    small date x product table.
+
+    Returns (summary, top_products): one summary row (total_sales,
+    avg_daily_sales, days, products) and the n_top products by sales,
+    both labelled with `report` so many reports can be concatenated.
+    Rows missing a date are left out of avg_daily_sales and days, rows
+    missing a product out of products and the top list.
+    """
+    missing = {"date", "product", "total_sales"} - set(df.columns)
+    if missing:
+        raise ValueError(f"Missing required columns: {sorted(missing)}")
+
+    # dropna=False keeps rows missing only one key; each rollup then drops
+    # NaN in its own key, as grouping the raw rows by that key would
+    by_date_product = (
+        df.groupby(["date", "product"], observed=True, sort=False, dropna=False)["total_sales"]
+        .sum()
+    )
+
+    daily = by_date_product.groupby(level="date", sort=False).sum()
+    products = by_date_product.groupby(level="product", sort=False).sum()
+
+    summary = pd.DataFrame({
+        "report": [report],
+        "total_sales": [df["total_sales"].sum()],
+        "avg_daily_sales": [daily.mean()],
+        "days": [len(daily)],
+        "products": [len(products)]
+    })
+
+    top = products.sort_values(ascending=False).head(n_top)
+    top_products = pd.DataFrame({
+        "report": report,
+        "rank": range(1, len(top) + 1),
+        "product": top.index,
+        "total_sales": top.values
+    })
+
+    return summary, top_products
+
+
+def _summarize_file(job):
+    path, n_top, read_kwargs = job
+
+    try:
+        df = read_excel_cached(path, **read_kwargs)
+        summary, top_products = summarize_sales(df, report=Path(path).stem, n_top=n_top)
+        return path, summary, top_products, None
+
+    except Exception as e:
+        return path, None, None, str(e)
+
+
+def summarize_sales_files(paths, n_top: int = 5, max_workers=None, **read_kwargs):
+    """
+    summarize_sales for many workbooks on a process pool, one report per
+    file labelled by its file name.
+
+    Returns (summary, top_products, failures): the concatenated fleet
+    tables and a dict of path -> error message.
+    """
+    jobs = [(path, n_top, read_kwargs) for path in paths]
+
+    summaries = []
+    tops = []
+    failures = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for path, summary, top_products, error in pool.map(_summarize_file, jobs):
+            if error is not None:
+                failures[path] = error
+            else:
+                summaries.append(summary)
+                tops.append(top_products)
+
+    if not summaries:
+        return pd.DataFrame(), pd.DataFrame(), failures
+
+    return (
+        pd.concat(summaries, ignore_index=True),
+        pd.concat(tops, ignore_index=True),
+        failures
+    )
+
+
+def render_report(summary: pd.DataFrame, top_products: pd.DataFrame, report=None) -> str:
+    """
+    Text report for one row of a summary table (the first if report is
+    not given).
+    """
+    if report is None:
+        report = summary["report"].iloc[0]
+
+    row = summary.loc[summary["report"] == report].iloc[0]
+    top = top_products.loc[top_products["report"] == report]
+
+    lines = []
+    lines.append("SALES PERFORMANCE REPORT\n")
+    lines.append(f"Total Sales: ${row['total_sales']:,.2f}")
+    lines.append(f"Average Daily Sales: ${row['avg_daily_sales']:,.2f}\n")
+
+    lines.append("Top Performing Products:")
+    for product, sales in zip(top["product"], top["total_sales"]):
+        lines.append(f"- {product}: ${sales:,.2f}")
+
+    return "\n".join(lines)
+
+
 class SalesReport:
-    def __init__(self, excel_path: str):
+    def __init__(self, excel_path: str = None, df: pd.DataFrame = None, n_top: int = 5):
         self.excel_path = excel_path
-        self.df = self._load_data()
-
-    def _load_data(self) -> pd.DataFrame:
-        return pd.read_excel(self.excel_path)
-
-    def _total_sales(self) -> float:
-        return self.df["total_sales"].sum()
-
-    def _avg_daily_sales(self) -> float:
-        return (
-            self.df
-            .groupby("date")["total_sales"]
-            .sum()
-            .mean()
-        )
-
-    def _top_products(self, n: int = 5):
-        return (
-            self.df
-            .groupby("product")["total_sales"]
-            .sum()
-            .sort_values(ascending=False)
-            .head(n)
-        )
+        self.n_top = n_top
+        self.df = df if df is not None else self._load_data()
 
-    def generate(self) -> str:
-        total_sales = self._total_sales()
-        avg_daily_sales = self._avg_daily_sales()
-        top_products = self._top_products()
+    @classmethod
+    def from_cube(cls, cube, **filters):
+        # Report over a SalesCube slice (machines, items, start, end); one
+        # row per item and day, Revenue as total_sales
+        df = cube.query(**filters).rename(columns={
+            "Day": "date",
+            "Item": "product",
+            "Revenue": "total_sales"
+        })
+        return cls(df=df[["date", "product", "total_sales"]])
 
-        lines = []
-        lines.append("SALES PERFORMANCE REPORT\n")
-        lines.append(f"Total Sales: ${total_sales:,.2f}")
-        lines.append(f"Average Daily Sales: ${avg_daily_sales:,.2f}\n")
+    def _load_data(self) -> pd.DataFrame:
+        return read_excel_cached(self.excel_path)
 
-        lines.append("Top Performing Products:")
-        for product, sales in top_products.items():
-            lines.append(f"- {product}: ${sales:,.2f}")
+    def summarize(self):
+        report = Path(self.excel_path).stem if self.excel_path else "report"
+        return summarize_sales(self.df, report=report, n_top=self.n_top)
 
-        return "\n".join(lines)
+    def generate(self) -> str:
+        return render_report(*self.summarize())
 
 
 if __name__ == "__main__":
     report = SalesReport("data/sales_data.xlsx")
-    print(report.generate())
\ No newline at end of file
+    print(report.generate())
+
+    summary, top_products, failures = summarize_sales_files(
+        sorted(Path("data/reports").glob("*.xlsx")),
+        max_workers=os.cpu_count()
+    )
+    print(summary.sort_values("total_sales", ascending=False).head(20))
@@ -0,0 +1,184 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from viq.Load.timeseries_loader import WEEKDAYS, TimeSeriesLoader
+
+
+CUBE_KEYS = ["Asset ID", "Item", "Day"]
+CUBE_VALUES = ["Quantity", "Revenue"]
+
+
+class SalesCube:
+    """
+    Daily sales pre-aggregated to one row per machine, item and day
+    (Asset ID, Item, Day -> Quantity, Revenue).
+
+    Built once from TimeSeriesLoader output and stored as parquet sorted
+    by machine and item, so reports and plots read a slice instead of
+    re-aggregating the vend log. Revenue is Quantity * price_column when
+    the export carries prices, otherwise NaN.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        missing = set(CUBE_KEYS + CUBE_VALUES) - set(df.columns)
+        if missing:
+            raise ValueError(f"Missing required columns: {sorted(missing)}")
+
+        self.df = df
+
+    @staticmethod
+    def _aggregate(df, machine_column, item_column, price_column):
+        revenue = (
+            df["Quantity"] * df[price_column]
+            if price_column in df.columns
+            else pd.Series(float("nan"), index=df.index)
+        )
+
+        return (
+            pd.DataFrame({
+                "Asset ID": df[machine_column].astype(str),
+                "Item": df[item_column].astype(str),
+                "Day": df["Day"],
+                "Quantity": df["Quantity"],
+                "Revenue": revenue
+            })
+            .groupby(CUBE_KEYS, sort=False)[CUBE_VALUES]
+            .sum(min_count=1)
+            .reset_index()
+        )
+
+    @classmethod
+    def _finish(cls, df):
+        df = df.sort_values(CUBE_KEYS, ignore_index=True)
+
+        df["Asset ID"] = df["Asset ID"].astype("category")
+        df["Item"] = df["Item"].astype("category")
+        df["Quantity"] = df["Quantity"].fillna(0).astype("int32")
+        df.insert(3, "Day_of_Week", df["Day"].dt.day_name().astype(WEEKDAYS))
+
+        return cls(df)
+
+    @classmethod
+    def from_frame(
+        cls,
+        df,
+        machine_column="Asset ID",
+        item_column="Item",
+        price_column="Price"
+    ):
+        """
+        Builds the cube from a TimeSeriesLoader frame already in memory.
+        """
+        return cls._finish(
+            cls._aggregate(df, machine_column, item_column, price_column)
+        )
+
+    @classmethod
+    def from_loader(
+        cls,
+        loader: TimeSeriesLoader,
+        machine_column="Asset ID",
+        item_column="Item",
+        price_column="Price"
+    ):
+        """
+        Builds the cube by streaming the loader chunk by chunk; only the
+        per-chunk aggregates are held in memory. Revenue is NaN when the
+        export has no price_column.
+        """
+        columns = [machine_column, item_column]
+        if price_column is not None and price_column in loader.header():
+            columns.append(price_column)
+
+        partials = [
+            cls._aggregate(chunk, machine_column, item_column, price_column)
+            for chunk in loader.iter_chunks(columns=columns)
+        ]
+
+        # Days split across chunks are combined here
+        df = (
+            pd.concat(partials, ignore_index=True)
+            .groupby(CUBE_KEYS, sort=False)[CUBE_VALUES]
+            .sum(min_count=1)
+            .reset_index()
+        )
+
+        return cls._finish(df)
+
+    def save(self, path, row_group_size=1_000_000):
+        table = pa.Table.from_pandas(self.df, preserve_index=False)
+        pq.write_table(table, path, row_group_size=row_group_size)
+
+    @classmethod
+    def load(cls, path, machines=None, items=None, start=None, end=None):
+        """
+        Reads a saved cube, pushing any machine / item / date filters down
+        to the parquet reader.
+        """
+        filters = []
+        if machines is not None:
+            filters.append(("Asset ID", "in", [str(m) for m in machines]))
+        if items is not None:
+            filters.append(("Item", "in", list(items)))
+        if start is not None:
+            filters.append(("Day", ">=", pd.Timestamp(start)))
+        if end is not None:
+            filters.append(("Day", "<=", pd.Timestamp(end)))
+
+        df = pq.read_table(path, filters=filters or None).to_pandas()
+        return cls(df)
+
+    def query(self, machines=None, items=None, start=None, end=None) -> pd.DataFrame:
+        """
+        Cube rows for the given machines, items and inclusive date range.
+        """
+        mask = pd.Series(True, index=self.df.index)
+
+        if machines is not None:
+            mask &= self.df["Asset ID"].isin([str(m) for m in machines])
+        if items is not None:
+            mask &= self.df["Item"].isin(list(items))
+        if start is not None:
+            mask &= self.df["Day"] >= pd.Timestamp(start)
+        if end is not None:
+            mask &= self.df["Day"] <= pd.Timestamp(end)
+
+        return self.df[mask]
+
+    def daily_totals(self, **filters) -> pd.DataFrame:
+        """
+        One row per Day with Day_of_Week, Quantity and Revenue.
+        """
+        return (
+            self.query(**filters)
+            .groupby(["Day", "Day_of_Week"], observed=True)[CUBE_VALUES]
+            .sum()
+            .reset_index()
+        )
+
+    def item_totals(self, **filters) -> pd.DataFrame:
+        return (
+            self.query(**filters)
+            .groupby("Item", observed=True)[CUBE_VALUES]
+            .sum()
+            .reset_index()
+        )
+
+    def machine_totals(self, **filters) -> pd.DataFrame:
+        return (
+            self.query(**filters)
+            .groupby("Asset ID", observed=True)[CUBE_VALUES]
+            .sum()
+            .reset_index()
+        )
+
+
+if __name__ == "__main__":
+    cube = SalesCube.from_loader(
+        TimeSeriesLoader("/Users/drewski/Downloads/timeseries.xlsx")
+    )
+    cube.save("sales_cube.parquet")
+
+    print(cube.daily_totals().tail())
+    print(cube.item_totals().sort_values("Quantity", ascending=False).head(10))
@@ -0,0 +1,234 @@
+import math
+import re
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+
+MONTH_PATTERN = re.compile(r"^\d{2}/\d{4}$")
+
+
+def get_month_columns(df):
+    return [c for c in df.columns if MONTH_PATTERN.match(str(c))]
+
+
+def monthly_sales_matrix(df, month_columns) -> np.ndarray:
+    return (
+        df[month_columns]
+        .apply(pd.to_numeric, errors="coerce")
+        .fillna(0.0)
+        .to_numpy(dtype=float)
+    )
+
+
+def daily_stats_table(df, month_columns, days_per_month) -> pd.DataFrame:
+    """
+    Per-row daily demand statistics from the first month with a sale
+    onward, computed for the whole month matrix in one masked pass.
+
+    Columns:
+    - first_sale_idx: index into month_columns, -1 if the item never sold
+    - months_since_launch
+    - avg_daily_sales, daily_std: unweighted mean and std (ddof=1)
+    - weighted_mean, weighted_std: weights 1..n so the most recent month
+      counts most
+    Items that never sold get 0.0 for every statistic.
+    """
+    daily = monthly_sales_matrix(df, month_columns) / days_per_month
+    n_rows, n_months = daily.shape
+
+    has_sale = daily > 0
+    ever_sold = has_sale.any(axis=1)
+    first_sale = np.where(ever_sold, has_sale.argmax(axis=1), -1)
+
+    # Months since launch get weights 1..n, everything before launch 0
+    weights = np.arange(n_months)[None, :] - first_sale[:, None] + 1
+    weights = np.where(ever_sold[:, None], np.maximum(weights, 0), 0)
+    live = weights > 0
+
+    n = live.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+
+    mean = np.where(live, daily, 0.0).sum(axis=1) / safe_n
+    sq_dev = np.where(live, (daily - mean[:, None]) ** 2, 0.0).sum(axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        std = np.sqrt(sq_dev / (n - 1))
+
+    weight_total = np.maximum(weights.sum(axis=1), 1)
+    weighted_mean = (weights * daily).sum(axis=1) / weight_total
+    weighted_var = (
+        (weights * (daily - weighted_mean[:, None]) ** 2).sum(axis=1)
+        / weight_total
+    )
+
+    return pd.DataFrame(
+        {
+            "first_sale_idx": first_sale,
+            "months_since_launch": n,
+            "avg_daily_sales": mean,
+            "daily_std": np.where(ever_sold, std, 0.0),
+            "weighted_mean": weighted_mean,
+            "weighted_std": np.sqrt(weighted_var)
+        },
+        index=df.index
+    )
+
+
+def wilson_interval(successes, n, confidence=0.95):
+    # Wilson score interval; stays sensible for rare events near 0
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = successes / n
+
+    center = (p + z ** 2 / (2 * n)) / (1 + z ** 2 / n)
+    half_width = (
+        z * math.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2))
+        / (1 + z ** 2 / n)
+    )
+
+    return max(center - half_width, 0.0), min(center + half_width, 1.0)
+
+
+def month_key(label):
+    # "MM/YYYY" -> months since year 0, for ordering month columns
+    month, year = str(label).split("/")
+    return int(year) * 12 + int(month) - 1
+
+
+class DemandStatsStore:
+    """
+    Running per-machine, per-item demand statistics, updated one month
+    column at a time.
+
+    For each item it keeps, from the first month with a sale onward:
+    n (months since launch), sum and sum of squares of monthly sales, and
+    the same sums weighted 1..n as in daily_stats_table. Old months never
+    need to be re-read; stats() returns the same columns as
+    daily_stats_table.
+
+    Machine ids are keyed as strings, so 14438 and "14438" are the same
+    machine before and after save() / load().
+    """
+
+    COLUMNS = ["n", "s1", "s2", "ws1", "ws2"]
+
+    def __init__(self):
+        self._frames = {}
+        self.last_month = {}
+
+    def _frame(self, machine_id):
+        frame = self._frames.get(str(machine_id))
+        if frame is None:
+            frame = pd.DataFrame(
+                {c: pd.Series(dtype=float) for c in self.COLUMNS},
+                index=pd.Index([], name="Item Name", dtype=object)
+            )
+        return frame
+
+    def update(self, machine_id, month, item_names, quantities):
+        """
+        Adds one month of sales for a machine. Months at or before the last
+        applied month are ignored (returns False); skipping a month raises
+        ValueError. Items already launched but missing from the update
+        count as zero sales.
+        """
+        machine_id = str(machine_id)
+        last = self.last_month.get(machine_id)
+        if last is not None:
+            gap = month_key(month) - month_key(last)
+            if gap <= 0:
+                return False
+            if gap > 1:
+                raise ValueError(
+                    f"Machine {machine_id}: expected the month after {last}, got {month}"
+                )
+
+        x = (
+            pd.to_numeric(
+                pd.Series(np.asarray(quantities), index=np.asarray(item_names)),
+                errors="coerce"
+            )
+            .fillna(0.0)
+            .groupby(level=0)
+            .sum()
+        )
+
+        frame = self._frame(machine_id)
+        index = frame.index.union(x.index)
+        frame = frame.reindex(index, fill_value=0.0)
+        x = x.reindex(index, fill_value=0.0)
+
+        launched = (frame["n"] > 0) | (x > 0)
+        frame["n"] += launched
+        w = frame["n"]
+
+        frame["s1"] += x
+        frame["s2"] += x ** 2
+        frame["ws1"] += w * x
+        frame["ws2"] += w * x ** 2
+
+        frame.index.name = "Item Name"
+        self._frames[machine_id] = frame[frame["n"] > 0]
+        self.last_month[machine_id] = month
+
+        return True
+
+    def update_from_export(self, machine_id, df_sales):
+        """
+        Applies every month column of a sales export newer than the last
+        month seen for this machine, oldest first. Returns the months
+        applied.
+        """
+        applied = []
+
+        for month in sorted(get_month_columns(df_sales), key=month_key):
+            if self.update(
+                machine_id, month, df_sales["Item Name"], df_sales[month]
+            ):
+                applied.append(month)
+
+        return applied
+
+    def stats(self, machine_id, days_per_month) -> pd.DataFrame:
+        frame = self._frame(machine_id)
+
+        n = frame["n"]
+        mean = frame["s1"] / n
+        weight_total = n * (n + 1) / 2
+        weighted_mean = frame["ws1"] / weight_total
+
+        sq_dev = (frame["s2"] - n * mean ** 2).clip(lower=0)
+        weighted_var = (frame["ws2"] / weight_total - weighted_mean ** 2).clip(lower=0)
+
+        return pd.DataFrame({
+            "months_since_launch": n.astype(int),
+            "avg_daily_sales": mean / days_per_month,
+            "daily_std": np.sqrt(sq_dev / (n - 1).where(n > 1)) / days_per_month,
+            "weighted_mean": weighted_mean / days_per_month,
+            "weighted_std": np.sqrt(weighted_var) / days_per_month
+        })
+
+    def save(self, path):
+        frames = []
+        for machine_id, frame in self._frames.items():
+            frame = frame.reset_index()
+            frame.insert(0, "machine_id", machine_id)
+            frame["last_month"] = self.last_month[machine_id]
+            frames.append(frame)
+
+        columns = ["machine_id", "Item Name"] + self.COLUMNS + ["last_month"]
+        table = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+        table.to_parquet(path, index=False)
+
+    @classmethod
+    def load(cls, path):
+        store = cls()
+        table = pd.read_parquet(path)
+        table["machine_id"] = table["machine_id"].astype(str)
+
+        for machine_id, frame in table.groupby("machine_id", sort=False):
+            store._frames[machine_id] = frame.set_index("Item Name")[cls.COLUMNS]
+            store.last_month[machine_id] = frame["last_month"].iloc[0]
+
+        return store
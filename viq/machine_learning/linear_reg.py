@@ -3,6 +3,11 @@ import numpy as np
 import pandas as pd
 from sklearn.linear_model import LinearRegression
 
+from viq.Load.cache import read_excel_cached
+
+
+# Groups whose sxx is below this fraction of sum(x^2) are treated as constant x
+SXX_RTOL = 1e-10
 
 class SimpleLinearRegressionModel:
     def __init__(self, file_path: str, x_column: str, y_column: str):
@@ -15,7 +20,7 @@ class SimpleLinearRegressionModel:
         self.y = None
 
     def load_data(self):
-        self.data = pd.read_excel(self.file_path)
+        self.data = read_excel_cached(self.file_path)
         self.X = self.data[[self.x_column]]
         self.y = self.data[self.y_column]
 
@@ -51,6 +56,103 @@ class SimpleLinearRegressionModel:
         plt.show()
 
 
+class GroupedLinearRegression:
+    """
+    Closed-form y = intercept + slope * x fitted separately for every
+    group (branch, customer, machine model, ...) from grouped sufficient
+    statistics, in one groupby over the data.
+
+    coefficients has one row per group: n, slope, intercept, r2,
+    slope_se, intercept_se and residual_std. Groups with fewer than two
+    rows or constant x get NaN.
+    """
+
+    def __init__(self, x_column: str, y_column: str, group_columns):
+        self.x_column = x_column
+        self.y_column = y_column
+        self.group_columns = (
+            [group_columns] if isinstance(group_columns, str) else list(group_columns)
+        )
+        self.coefficients = None
+
+    def fit(self, df: pd.DataFrame):
+        missing = set(self.group_columns + [self.x_column, self.y_column]) - set(df.columns)
+        if missing:
+            raise ValueError(f"Missing required columns: {sorted(missing)}")
+
+        df = df.dropna(subset=[self.x_column, self.y_column])
+        x = df[self.x_column].to_numpy(float)
+        y = df[self.y_column].to_numpy(float)
+
+        # Shifting by the overall means keeps the sums of squares from
+        # cancelling catastrophically; slopes are unaffected
+        x_shift, y_shift = x.mean(), y.mean()
+        x = x - x_shift
+        y = y - y_shift
+
+        sums = (
+            df[self.group_columns]
+            .assign(n=1.0, x=x, y=y, xx=x * x, xy=x * y, yy=y * y)
+            .groupby(self.group_columns, observed=True)
+            .sum()
+        )
+        n = sums["n"].to_numpy()
+
+        x_mean = sums["x"].to_numpy() / n
+        y_mean = sums["y"].to_numpy() / n
+        sxx = sums["xx"].to_numpy() - n * x_mean ** 2
+        sxy = sums["xy"].to_numpy() - n * x_mean * y_mean
+        syy = sums["yy"].to_numpy() - n * y_mean ** 2
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Constant x leaves only round-off in sxx, relative to xx
+            valid = (n >= 2) & (sxx > SXX_RTOL * sums["xx"].to_numpy())
+            slope = np.where(valid, sxy / sxx, np.nan)
+            intercept = (y_mean + y_shift) - slope * (x_mean + x_shift)
+
+            sse = np.maximum(syy - slope * sxy, 0)
+            r2 = np.where(syy > 0, 1 - sse / syy, np.nan)
+            sigma2 = np.where(n > 2, sse / (n - 2), np.nan)
+
+            slope_se = np.sqrt(sigma2 / sxx)
+            intercept_se = np.sqrt(sigma2 * (1 / n + (x_mean + x_shift) ** 2 / sxx))
+
+        self.coefficients = pd.DataFrame(
+            {
+                "n": n.astype(int),
+                "slope": slope,
+                "intercept": intercept,
+                "r2": r2,
+                "slope_se": slope_se,
+                "intercept_se": intercept_se,
+                "residual_std": np.sqrt(sigma2)
+            },
+            index=sums.index
+        )
+
+        return self
+
+    def predict(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Predictions for every row of df (group columns plus x_column),
+        NaN for groups that were not fitted.
+        """
+        if self.coefficients is None:
+            raise ValueError("Model not fitted. Call fit() first.")
+
+        if len(self.group_columns) > 1:
+            keys = pd.MultiIndex.from_frame(df[self.group_columns])
+        else:
+            keys = pd.Index(df[self.group_columns[0]])
+
+        coef = self.coefficients.reindex(keys)
+
+        return (
+            coef["intercept"].to_numpy()
+            + coef["slope"].to_numpy() * df[self.x_column].to_numpy(float)
+        )
+
+
 if __name__ == "__main__":
     file_path = "/Users/andrewleacock1/Downloads/machine_visits_revenue_2025.xlsx"
 
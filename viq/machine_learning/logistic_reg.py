@@ -1,157 +1,308 @@
-# import numpy as np
-# import plotly.express as px
-# import pandas as pd
-
-# df = pd.read_excel("/Users/andrewleacock1/Downloads/xxx.xlsx")
-
-# # split the two tables
-# left = df[["Asset ID","rev"]].dropna()
-# right = df[["Asset ID.1","Visit Count 90"]].dropna()
-
-# right = right.rename(columns={
-#     "Asset ID.1":"Asset ID",
-#     "Visit Count 90":"visit_90d"
-# })
-
-# merged = left.merge(right, on="Asset ID", how="inner")
-
-# # Data
-# X = merged["visit_90d"].to_numpy(dtype=float)
-# y = merged["rev"].to_numpy(dtype=int)
-
-# # Train / Test split
-# split = int(len(X) * 0.8)
-# X_train, X_test = X[:split], X[split:]
-# y_train, y_test = y[:split], y[split:]
-# n = len(X_train)
-
-# # scale using train only
-# mu = X_train.mean()
-# sigma = X_train.std()
-
-# X_train = (X_train - mu) / sigma
-# X_test  = (X_test  - mu) / sigma
-
-# def sigmoid(z):
-#     return 1 / (1 + np.exp(-z))
-
-# def compute_loss(z, y):
-#     lg = sigmoid(z)
-#     lg = np.clip(lg, 1e-15, 1 - 1e-15)
-#     return -(y * np.log(lg) + (1 - y) * np.log(1 - lg))
-
-# def accuracy(w, b):
-#     preds = sigmoid(w * X_test + b)
-#     preds_class = (preds >= 0.5).astype(int)
-#     return (preds_class == y_test).mean()
-
-# lr = 0.01
-# epochs = 5
-
-# # =========================
-# # SGD
-# # =========================
-# w = np.random.randn()
-# b = np.random.randn()
-# sgd_loss = []
-
-# for _ in range(epochs):
-#     for i in np.random.permutation(n):
-#         z = w * X_train[i] + b
-#         sgd_loss.append(compute_loss(z, y_train[i]))
-
-#         lg = sigmoid(z)
-#         w -= lr * (lg - y_train[i]) * X_train[i]
-#         b -= lr * (lg - y_train[i])
-
-# print("\nSGD Results")
-# print("w:", w)
-# print("b:", b)
-# print("Test Accuracy:", accuracy(w, b))
-
-# fig1 = px.line(y=sgd_loss, title="SGD Loss")
-# fig1.show()
-
-# # =========================
-# # Mini Batch
-# # =========================
-# w = np.random.randn()
-# b = np.random.randn()
-# batch_size = 256
-# mini_loss = []
-
-# for _ in range(epochs):
-#     idx = np.random.permutation(n)
-#     X_shuff = X_train[idx]
-#     y_shuff = y_train[idx]
-
-#     for i in range(0, n, batch_size):
-#         Xb = X_shuff[i:i+batch_size]
-#         yb = y_shuff[i:i+batch_size]
-
-#         z = w * Xb + b
-#         mini_loss.append(np.mean(compute_loss(z, yb)))
-
-#         lg = sigmoid(z)
-#         w -= lr * np.mean((lg - yb) * Xb)
-#         b -= lr * np.mean(lg - yb)
-
-# print("\nMini Batch Results")
-# print("w:", w)
-# print("b:", b)
-# print("Test Accuracy:", accuracy(w, b))
-
-# fig2 = px.line(y=mini_loss, title="Mini Batch Loss")
-# fig2.show()
-
-# # =========================
-# # Full Batch
-# # =========================
-# w = np.random.randn()
-# b = np.random.randn()
-# full_loss = []
-
-# for _ in range(epochs * 100):
-#     z = w * X_train + b
-#     full_loss.append(np.mean(compute_loss(z, y_train)))
-
-#     lg = sigmoid(z)
-#     w -= lr * np.mean((lg - y_train) * X_train)
-#     b -= lr * np.mean(lg - y_train)
-
-# print("\nFull Batch Results")
-# print("w:", w)
-# print("b:", b)
-# print("Test Accuracy:", accuracy(w, b))
-
-# fig3 = px.line(y=full_loss, title="Full Batch Loss")
-# fig3.show()
-
-# # =========================
-# # Model Evaluation
-# # =========================
-# probs = sigmoid(w * X_test + b)
-# preds = (probs >= 0.5).astype(int)
-
-# tp = np.sum((preds==1)&(y_test==1))
-# fp = np.sum((preds==1)&(y_test==0))
-# fn = np.sum((preds==0)&(y_test==1))
-# tn = np.sum((preds==0)&(y_test==0))
-
-# precision = tp/(tp+fp) if (tp+fp)>0 else 0
-# recall = tp/(tp+fn) if (tp+fn)>0 else 0
-# accuracy = (tp+tn)/len(y_test)
-
-# print("\nConfusion Matrix")
-# print("TP:",tp,"FP:",fp,"FN:",fn,"TN:",tn)
-
-# print("\nMetrics")
-# print("Accuracy:",accuracy)
-# print("Precision:",precision)
-# print("Recall:",recall)
-
-# order = np.argsort(-probs)
-# top = y_test[order][:50]
-
-# print("\nTop 50 predicted bad machines actually bad rate:")
-# print(top.mean())
\ No newline at end of file
+import numpy as np
+import pandas as pd
+
+from viq.Load.cache import read_excel_cached
+
+
+def sigmoid(z):
+    # tanh form does not overflow for large |z|
+    return 0.5 * (1.0 + np.tanh(0.5 * z))
+
+
+def log_loss(probs, y):
+    probs = np.clip(probs, 1e-15, 1 - 1e-15)
+    return float(-np.mean(y * np.log(probs) + (1 - y) * np.log(1 - probs)))
+
+
+def load_visit_revenue(file_path) -> pd.DataFrame:
+    """
+    The bad-machine export: Asset ID / rev side by side with
+    Asset ID.1 / Visit Count 90, merged on asset as Asset ID, rev,
+    visit_90d.
+    """
+    df = read_excel_cached(file_path)
+
+    left = df[["Asset ID", "rev"]].dropna()
+    right = df[["Asset ID.1", "Visit Count 90"]].dropna().rename(columns={
+        "Asset ID.1": "Asset ID",
+        "Visit Count 90": "visit_90d"
+    })
+
+    return left.merge(right, on="Asset ID", how="inner")
+
+
+class LogisticRegressionModel:
+    """
+    Multi-feature logistic regression trained with vectorized mini-batch
+    gradient descent.
+
+    fit() trains on a DataFrame in memory; fit_stream() trains over
+    chunks that do not fit in memory (e.g. TimeSeriesLoader.iter_chunks
+    or pd.read_csv(..., chunksize=...)). Both stop early once validation
+    loss has not improved by tol for `patience` epochs and keep the best
+    weights. Features are standardised with the training mean / std.
+    """
+
+    def __init__(
+        self,
+        features,
+        target="rev",
+        lr=0.1,
+        batch_size=256,
+        epochs=50,
+        patience=3,
+        tol=1e-4,
+        l2=0.0,
+        seed=0
+    ):
+        self.features = [features] if isinstance(features, str) else list(features)
+        self.target = target
+        self.lr = lr
+        self.batch_size = batch_size
+        self.epochs = epochs
+        self.patience = patience
+        self.tol = tol
+        self.l2 = l2
+        self.rng = np.random.default_rng(seed)
+
+        self.mean = None
+        self.std = None
+        self.w = None
+        self.b = 0.0
+        self.history = []
+
+    # -----------------------------
+    # DATA
+    # -----------------------------
+    def _xy(self, df):
+        missing = set(self.features + [self.target]) - set(df.columns)
+        if missing:
+            raise ValueError(f"Missing required columns: {sorted(missing)}")
+
+        df = df.dropna(subset=self.features + [self.target])
+        return df[self.features].to_numpy(float), df[self.target].to_numpy(float)
+
+    def _scale(self, X):
+        return (X - self.mean) / self.std
+
+    def fit_scaler(self, chunks):
+        """
+        Training mean / std from one pass over an iterable of frames.
+        """
+        n = 0
+        total = np.zeros(len(self.features))
+        total_sq = np.zeros(len(self.features))
+
+        for chunk in chunks:
+            X, _ = self._xy(chunk)
+            n += len(X)
+            total += X.sum(axis=0)
+            total_sq += (X ** 2).sum(axis=0)
+
+        if n == 0:
+            raise ValueError("No training rows")
+
+        self.mean = total / n
+        self.std = np.sqrt(np.maximum(total_sq / n - self.mean ** 2, 0))
+        self.std[self.std == 0] = 1.0
+
+        return self
+
+    # -----------------------------
+    # TRAINING
+    # -----------------------------
+    def _train_epoch(self, X, y):
+        # X is already scaled; one shuffled pass of mini-batch updates
+        order = self.rng.permutation(len(X))
+        losses = []
+
+        for start in range(0, len(X), self.batch_size):
+            idx = order[start:start + self.batch_size]
+            Xb, yb = X[idx], y[idx]
+
+            probs = sigmoid(Xb @ self.w + self.b)
+            error = probs - yb
+
+            self.w -= self.lr * (Xb.T @ error / len(idx) + self.l2 * self.w)
+            self.b -= self.lr * error.mean()
+
+            losses.append(log_loss(probs, yb) * len(idx))
+
+        return losses
+
+    def _start(self):
+        self.w = np.zeros(len(self.features))
+        self.b = 0.0
+        self.history = []
+
+    def _early_stop(self, epoch, train_loss, validation, best):
+        # Returns the updated (best_loss, best_params, stale_epochs)
+        val_loss = self.loss(validation) if validation is not None else None
+        self.history.append({"epoch": epoch, "train_loss": train_loss, "val_loss": val_loss})
+
+        best_loss, best_params, stale = best
+        if val_loss is None:
+            return best_loss, best_params, stale
+
+        if val_loss < best_loss - self.tol:
+            return val_loss, (self.w.copy(), self.b), 0
+
+        return best_loss, best_params, stale + 1
+
+    def fit(self, df: pd.DataFrame, validation: pd.DataFrame = None, validation_fraction=0.2):
+        """
+        Trains in memory. Without a validation frame, validation_fraction
+        of df (shuffled) is held out for early stopping.
+        """
+        if validation is None and validation_fraction:
+            holdout = self.rng.random(len(df)) < validation_fraction
+            df, validation = df[~holdout], df[holdout]
+
+        self.fit_scaler([df])
+        X, y = self._xy(df)
+        X = self._scale(X)
+
+        self._start()
+        best = (np.inf, None, 0)
+
+        for epoch in range(self.epochs):
+            losses = self._train_epoch(X, y)
+            best = self._early_stop(epoch, sum(losses) / len(X), validation, best)
+            if best[2] >= self.patience:
+                break
+
+        if best[1] is not None:
+            self.w, self.b = best[1]
+
+        return self
+
+    def partial_fit(self, df: pd.DataFrame):
+        """
+        One pass of mini-batch updates over a chunk. The scaler comes
+        from fit_scaler(), or from this chunk if not yet fitted.
+        """
+        if self.mean is None:
+            self.fit_scaler([df])
+        if self.w is None:
+            self._start()
+
+        X, y = self._xy(df)
+        return self._train_epoch(self._scale(X), y)
+
+    def fit_stream(self, make_chunks, validation: pd.DataFrame = None):
+        """
+        Out-of-core training. make_chunks() must return a fresh iterable
+        of frames on every call: one pass fits the scaler, then each
+        epoch streams every chunk through partial_fit.
+        """
+        self.fit_scaler(make_chunks())
+        self._start()
+        best = (np.inf, None, 0)
+
+        for epoch in range(self.epochs):
+            total, n = 0.0, 0
+            for chunk in make_chunks():
+                losses = self.partial_fit(chunk)
+                total += sum(losses)
+                n += len(chunk)
+
+            best = self._early_stop(epoch, total / max(n, 1), validation, best)
+            if best[2] >= self.patience:
+                break
+
+        if best[1] is not None:
+            self.w, self.b = best[1]
+
+        return self
+
+    # -----------------------------
+    # SCORING
+    # -----------------------------
+    def predict_proba(self, df: pd.DataFrame) -> np.ndarray:
+        if self.w is None:
+            raise ValueError("Model not fitted. Call fit() first.")
+
+        X = df[self.features].to_numpy(float)
+        return sigmoid(self._scale(X) @ self.w + self.b)
+
+    def loss(self, df: pd.DataFrame) -> float:
+        df = df.dropna(subset=self.features + [self.target])
+        return log_loss(self.predict_proba(df), df[self.target].to_numpy(float))
+
+    def evaluate(self, df: pd.DataFrame, threshold=0.5, top=50) -> dict:
+        df = df.dropna(subset=self.features + [self.target])
+        probs = self.predict_proba(df)
+        y = df[self.target].to_numpy(int)
+        preds = (probs >= threshold).astype(int)
+
+        tp = int(np.sum((preds == 1) & (y == 1)))
+        fp = int(np.sum((preds == 1) & (y == 0)))
+        fn = int(np.sum((preds == 0) & (y == 1)))
+        tn = int(np.sum((preds == 0) & (y == 0)))
+
+        top_idx = np.argsort(-probs)[:top]
+
+        return {
+            "tp": tp,
+            "fp": fp,
+            "fn": fn,
+            "tn": tn,
+            "accuracy": (tp + tn) / len(y) if len(y) else 0.0,
+            "precision": tp / (tp + fp) if (tp + fp) > 0 else 0.0,
+            "recall": tp / (tp + fn) if (tp + fn) > 0 else 0.0,
+            "log_loss": log_loss(probs, y),
+            f"top_{top}_bad_rate": float(y[top_idx].mean()) if len(top_idx) else 0.0
+        }
+
+    def rank(self, frames, id_column="Asset ID", top=50) -> pd.DataFrame:
+        """
+        The `top` highest-risk rows across a frame or an iterable of
+        frames (scored chunk by chunk, only the running top kept), as
+        id_column, probability.
+        """
+        if isinstance(frames, pd.DataFrame):
+            frames = [frames]
+
+        best = None
+
+        for chunk in frames:
+            chunk = chunk.dropna(subset=self.features)
+            scored = pd.DataFrame({
+                id_column: chunk[id_column].to_numpy(),
+                "probability": self.predict_proba(chunk)
+            })
+            if best is not None:
+                scored = pd.concat([best, scored], ignore_index=True)
+            best = scored.nlargest(top, "probability")
+
+        return best.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    merged = load_visit_revenue("/Users/andrewleacock1/Downloads/xxx.xlsx")
+
+    # Train / Test split
+    split = int(len(merged) * 0.8)
+    train, test = merged.iloc[:split], merged.iloc[split:]
+
+    model = LogisticRegressionModel(features=["visit_90d"], target="rev")
+    model.fit(train)
+
+    print("w:", model.w)
+    print("b:", model.b)
+    print("Epochs:", len(model.history))
+
+    metrics = model.evaluate(test)
+    print("\nConfusion Matrix")
+    print("TP:", metrics["tp"], "FP:", metrics["fp"], "FN:", metrics["fn"], "TN:", metrics["tn"])
+
+    print("\nMetrics")
+    print("Accuracy:", metrics["accuracy"])
+    print("Precision:", metrics["precision"])
+    print("Recall:", metrics["recall"])
+
+    print("\nTop 50 predicted bad machines actually bad rate:")
+    print(metrics["top_50_bad_rate"])
+
+    print("\nTop 50 predicted bad machines:")
+    print(model.rank(merged))
@@ -1,9 +1,33 @@
+import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
 
 
 
 class Scatter3DPlot:
-    def __init__(self, x, y, z, c=None, asset_id=None, customer_name=None,opacity=0.2):
+    """
+    3D asset scatter. With voxels set, the space is binned into
+    voxels x voxels x voxels cells and one marker is drawn per non-empty
+    cell (sized by asset count, coloured by mean c or count), plus the
+    individual assets in sparse cells (at most outlier_count assets) as
+    outliers, capped at max_outliers. Hover text is assembled by Plotly
+    from customdata, only for the points drawn.
+    """
+
+    def __init__(
+        self,
+        x,
+        y,
+        z,
+        c=None,
+        asset_id=None,
+        customer_name=None,
+        opacity=0.2,
+        voxels=None,
+        outlier_count=1,
+        max_outliers=2_000,
+        seed=0
+    ):
         self.x = x
         self.y = y
         self.z = z
@@ -11,23 +35,129 @@ class Scatter3DPlot:
         self.asset_id = asset_id
         self.customer_name = customer_name
         self.opacity = opacity
-        
+        self.voxels = voxels
+        self.outlier_count = outlier_count
+        self.max_outliers = max_outliers
+        self.seed = seed
+        self.voxel_of = None
 
-    def figure(self):
-        fig = go.Figure(
-            data=[
-                go.Scatter3d(
-                    x=self.x,
-                    y=self.y,
-                    z=self.z,
-                    mode="markers",
-                    opacity=self.opacity,
-                    marker=dict(color=self.c) if self.c is not None else None,
-                    hovertext= self.asset_id.astype(str) + " | " + self.customer_name.astype(str),
-                    hoverinfo="text"
-                )
-            ]
+    def _hover_data(self, rows=None):
+        # Raw columns for Plotly to format, instead of pre-built strings
+        columns = [
+            s if s is not None else pd.Series("", index=self.x.index)
+            for s in (self.asset_id, self.customer_name)
+        ]
+        data = np.column_stack([np.asarray(s, dtype=object) for s in columns])
+        return data if rows is None else data[rows]
+
+    def _points_trace(self, rows=None, name=None):
+        def take(s):
+            return s if rows is None else np.asarray(s)[rows]
+
+        return go.Scatter3d(
+            x=take(self.x),
+            y=take(self.y),
+            z=take(self.z),
+            mode="markers",
+            name=name,
+            opacity=self.opacity,
+            marker=dict(color=take(self.c)) if self.c is not None else None,
+            customdata=self._hover_data(rows),
+            hovertemplate="%{customdata[0]} | %{customdata[1]}<extra></extra>"
+        )
+
+    def voxel_table(self) -> pd.DataFrame:
+        """
+        One row per non-empty voxel: count, mean x / y / z and mean c.
+        Also sets self.voxel_of (voxel row for every asset, -1 if any
+        coordinate is missing).
+        """
+        coords = np.column_stack([
+            pd.to_numeric(s, errors="coerce").to_numpy(float)
+            for s in (self.x, self.y, self.z)
+        ])
+        valid = ~np.isnan(coords).any(axis=1)
+
+        lo = np.nanmin(coords, axis=0)
+        span = np.nanmax(coords, axis=0) - lo
+        span[span == 0] = 1.0
+
+        cell = np.clip(
+            ((coords[valid] - lo) / span * self.voxels).astype(np.int64),
+            0,
+            self.voxels - 1
         )
+        flat = (cell[:, 0] * self.voxels + cell[:, 1]) * self.voxels + cell[:, 2]
+
+        _, inverse, counts = np.unique(flat, return_inverse=True, return_counts=True)
+
+        def mean(values):
+            return np.bincount(inverse, weights=values, minlength=len(counts)) / counts
+
+        table = pd.DataFrame({
+            "count": counts,
+            "x": mean(coords[valid, 0]),
+            "y": mean(coords[valid, 1]),
+            "z": mean(coords[valid, 2])
+        })
+
+        if self.c is not None:
+            # Mean over the assets with a colour value; NaN if none have one
+            c = pd.to_numeric(self.c, errors="coerce").to_numpy(float)[valid]
+            has_c = np.isfinite(c)
+            c_sum = np.bincount(inverse[has_c], weights=c[has_c], minlength=len(counts))
+            c_count = np.bincount(inverse[has_c], minlength=len(counts))
+            table["c"] = np.divide(
+                c_sum, c_count, out=np.full(len(counts), np.nan), where=c_count > 0
+            )
+
+        self.voxel_of = np.full(len(coords), -1)
+        self.voxel_of[valid] = inverse
+
+        return table
+
+    def _voxel_traces(self):
+        table = self.voxel_table()
+        color = table["c"] if "c" in table else table["count"]
+
+        traces = [
+            go.Scatter3d(
+                x=table["x"],
+                y=table["y"],
+                z=table["z"],
+                mode="markers",
+                name="Voxels",
+                opacity=self.opacity,
+                marker=dict(
+                    size=4 + 16 * np.sqrt(table["count"] / table["count"].max()),
+                    color=color,
+                    colorbar=dict(title=self.c.name if self.c is not None else "Assets")
+                ),
+                customdata=np.column_stack([table["count"], color]),
+                hovertemplate=
+                    "Assets: %{customdata[0]}<br>"
+                    "Mean: (%{x:.2f}, %{y:.2f}, %{z:.2f})<br>"
+                    "Colour: %{customdata[1]:.2f}"
+                    "<extra></extra>"
+            )
+        ]
+
+        sparse = table["count"].to_numpy() <= self.outlier_count
+        rows = np.flatnonzero((self.voxel_of >= 0) & sparse[np.maximum(self.voxel_of, 0)])
+
+        if len(rows) > self.max_outliers:
+            rng = np.random.default_rng(self.seed)
+            rows = np.sort(rng.choice(rows, self.max_outliers, replace=False))
+
+        if len(rows):
+            traces.append(self._points_trace(rows, name="Outliers"))
+
+        return traces
+
+    def figure(self):
+        data = self._voxel_traces() if self.voxels else [self._points_trace()]
+
+        fig = go.Figure(data=data)
 
         fig.update_layout(
             scene=dict(
@@ -44,10 +174,8 @@ class Scatter3DPlot:
 
 
 if __name__ == "__main__":
-    import pandas as pd
-
     df = pd.read_excel("/Users/andrewleacock1/Downloads/scat.xlsx")
-    
+
 
     Scatter3DPlot(
         x=df["Avg Qty Sold per Visit"],
@@ -56,8 +184,6 @@ if __name__ == "__main__":
         c=df["Number Spoiled"],
         asset_id=df["Asset ID"],
         customer_name=df["Branch Name"], # Customer Name
-        opacity=0.5
+        opacity=0.5,
+        voxels=40 if len(df) > 20_000 else None
     ).show()
-
-
-    
\ No newline at end of file
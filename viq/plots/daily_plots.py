@@ -1,30 +1,44 @@
 import plotly.express as px
 
+from viq.plots.render import decimate, render
+
 
 class DailyPlots:
-    def __init__(self, df):
+    def __init__(self, df, max_points=None, method="lttb"):
+        # max_points opts in to decimating long series ("lttb" or "minmax")
         self.df = df
+        self.max_points = max_points
+        self.method = method
+
+    @classmethod
+    def from_cube(cls, cube, max_points=None, method="lttb", **filters):
+        # Plots daily totals of a SalesCube slice (machines, items, start, end)
+        return cls(cube.daily_totals(**filters), max_points, method)
 
-    def plot_daily_totals(self):
+    def plot_daily_totals(self, output=None):
         daily_totals = (
             self.df
-            .groupby("Date", as_index=False)["Quantity"]
+            .groupby("Day", as_index=False)["Quantity"]
             .sum()
         )
 
+        daily_totals = decimate(
+            daily_totals, "Day", "Quantity", self.max_points, self.method
+        )
+
         fig = px.bar(
             daily_totals,
-            x="Date",
+            x="Day",
             y="Quantity",
             title="Total Quantity Sold Per Day"
         )
 
-        fig.show()
+        return render(fig, output)
 
-    def plot_day_of_week_totals(self):
+    def plot_day_of_week_totals(self, output=None):
         dow_totals = (
             self.df
-            .groupby("Day_of_Week", as_index=False)["Quantity"]
+            .groupby("Day_of_Week", as_index=False, observed=False)["Quantity"]
             .sum()
         )
 
@@ -35,7 +49,7 @@ class DailyPlots:
             title="Total Quantity Sold by Day of Week"
         )
 
-        fig.show()
+        return render(fig, output)
 
 
 if __name__ == "__main__":
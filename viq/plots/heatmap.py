@@ -1,51 +1,133 @@
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 
+from viq.Load.cache import read_excel_cached
+
+
+# Row letters (optional, "NUM" when missing) and slot number in one pass
+SLOT_PATTERN = r"(?P<row>[A-Za-z]+)?\D*?(?P<col>\d+)"
+
+
+def _parse_labels(categories) -> pd.DataFrame:
+    labels = categories.to_series().str.extract(SLOT_PATTERN)
+    labels["row"] = labels["row"].fillna("NUM")
+    labels["col"] = labels["col"].astype(int)
+    return labels
+
+
+def _unique_pairs(a, b, b_size):
+    # Distinct (a, b) code pairs via one combined int64 key
+    keys = np.unique(a.astype(np.int64) * max(b_size, 1) + b)
+    return np.divmod(keys, max(b_size, 1))
+
+
+def slot_table(df: pd.DataFrame, machine_column=None) -> pd.DataFrame:
+    """
+    One row per slot (row, col) with total Quantity and the distinct items
+    seen in it. With machine_column, also the number of machines using
+    the slot and the average quantity per machine.
+
+    Slots and items are aggregated on integer codes; string joins only
+    happen once per distinct (slot, item) pair.
+    """
+    df = df[df["Selection"].notna()]
+
+    selection = df["Selection"].astype(str).astype("category")
+    labels = _parse_labels(selection.cat.categories)
+
+    # Labels that parse to the same slot ("A1", "A01") share a code
+    label_to_slot, slots = pd.MultiIndex.from_frame(labels[["row", "col"]]).factorize()
+    slot_codes = label_to_slot[selection.cat.codes.to_numpy()]
+    n_slots = len(slots)
+
+    quantity = np.bincount(
+        slot_codes,
+        weights=pd.to_numeric(df["Quantity"], errors="coerce").fillna(0).to_numpy(float),
+        minlength=n_slots
+    )
+
+    table = pd.DataFrame({
+        "row": slots.get_level_values(0),
+        "col": slots.get_level_values(1),
+        "Quantity": quantity
+    })
+
+    items = df["Item"].astype("category")
+    item_codes = items.cat.codes.to_numpy()
+    has_item = item_codes >= 0
+
+    pair_slots, pair_items = _unique_pairs(
+        slot_codes[has_item], item_codes[has_item], len(items.cat.categories)
+    )
+
+    table["Item"] = (
+        pd.Series(items.cat.categories[pair_items].astype(str))
+        .groupby(pair_slots)
+        .agg(", ".join)
+        .reindex(range(n_slots), fill_value="")
+        .to_numpy()
+    )
+
+    if machine_column is not None:
+        machines = df[machine_column].astype("category")
+        machine_codes = machines.cat.codes.to_numpy()
+        has_machine = machine_codes >= 0
+
+        pair_slots, _ = _unique_pairs(
+            slot_codes[has_machine], machine_codes[has_machine], len(machines.cat.categories)
+        )
+
+        table["Machines"] = np.bincount(pair_slots, minlength=n_slots)
+        table["Per Machine"] = table["Quantity"] / np.maximum(table["Machines"], 1)
+
+    return table
+
 
 class VendingHeatmap:
-    def __init__(self, excel_path: str):
+    def __init__(self, excel_path: str = None, df: pd.DataFrame = None, machine_column=None):
         self.excel_path = excel_path
-        self.df = None
+        self.df = df
+        self.machine_column = machine_column
         self.slot_matrix = None
         self.pivot_qty = None
         self.pivot_items = None
 
-    def load_data(self):
-        self.df = pd.read_excel(self.excel_path)
-
-        # Extract letters (row) and numbers (column)
-        self.df["row"] = self.df["Selection"].str.extract(r"([A-Za-z]+)", expand=False)
-        self.df["col"] = (
-            self.df["Selection"]
-            .str.extract(r"(\d+)", expand=False)
-            .astype(int)
-        )
-
-        # Handle numeric-only selections like "100"
-        self.df["row"] = self.df["row"].fillna("NUM")
-
-    def aggregate(self):
-        # Total quantity per slot
-        slot_qty = (
-            self.df.groupby(["row", "col"])["Quantity"]
+    @classmethod
+    def from_fleet(cls, frames, machine_column="Asset ID"):
+        """
+        Fleet heatmap over many machines of the same model. frames is any
+        iterable of transaction frames (e.g. TimeSeriesLoader.iter_chunks
+        or one frame per machine); each is reduced to per machine / slot /
+        item totals as it arrives, so the raw rows are never held together.
+        Cells show the average quantity per machine using the slot.
+        """
+        keys = [machine_column, "Selection", "Item"]
+
+        partials = [
+            frame[keys + ["Quantity"]]
+            .groupby(keys, observed=True, sort=False, dropna=False)["Quantity"]
             .sum()
             .reset_index()
-        )
+            for frame in frames
+        ]
 
-        # Item names per slot
-        slot_items = (
-            self.df.groupby(["row", "col"])["Item"]
-            .apply(lambda x: ", ".join(x.dropna().unique()))
-            .reset_index(name="Item")
-        )
+        return cls(df=pd.concat(partials, ignore_index=True), machine_column=machine_column)
 
-        self.slot_matrix = slot_qty.merge(slot_items, on=["row", "col"])
+    def load_data(self):
+        if self.df is None:
+            self.df = read_excel_cached(self.excel_path)
+
+    def aggregate(self):
+        self.slot_matrix = slot_table(self.df, self.machine_column)
 
     def pivot(self):
+        value = "Per Machine" if self.machine_column else "Quantity"
+
         self.pivot_qty = self.slot_matrix.pivot(
             index="row",
             columns="col",
-            values="Quantity"
+            values=value
         )
 
         self.pivot_items = self.slot_matrix.pivot(
@@ -68,6 +150,8 @@ class VendingHeatmap:
         )
 
     def plot(self):
+        fleet = self.machine_column is not None
+
         fig = go.Figure(
             go.Heatmap(
                 z=self.pivot_qty.values,
@@ -77,14 +161,14 @@ class VendingHeatmap:
                 colorscale="Plasma",
                 hovertemplate=
                     "Slot: %{y}%{x}<br>"
-                    "Value: %{z}<br>"
-                    "Item: %{customdata}"
+                    + ("Avg per machine: %{z:.1f}<br>" if fleet else "Value: %{z}<br>")
+                    + "Item: %{customdata}"
                     "<extra></extra>"
             )
         )
 
         fig.update_layout(
-            title="Vending Machine Slot Heatmap",
+            title="Fleet Slot Heatmap" if fleet else "Vending Machine Slot Heatmap",
             xaxis_title="Slot Number",
             yaxis_title="Row",
             yaxis_autorange="reversed"
@@ -0,0 +1,120 @@
+from pathlib import Path
+
+import numpy as np
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return values.astype(float)
+
+
+def lttb_indices(x, y, max_points):
+    """
+    Largest-Triangle-Three-Buckets: indices of max_points points that keep
+    the visual shape of the series. x must be sorted.
+    """
+    n = len(y)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    y = _as_float(y)
+
+    # First and last points are always kept; the rest is split into
+    # max_points - 2 buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    prev = 0
+    for b in range(max_points - 2):
+        start, stop = edges[b], edges[b + 1]
+
+        # Average of the next bucket is the third triangle vertex
+        next_stop = edges[b + 2] if b + 2 < len(edges) else n
+        next_x = x[stop:next_stop].mean()
+        next_y = y[stop:next_stop].mean()
+
+        area = np.abs(
+            (x[prev] - next_x) * (y[start:stop] - y[prev])
+            - (x[prev] - x[start:stop]) * (next_y - y[prev])
+        )
+
+        prev = start + int(area.argmax())
+        selected[b + 1] = prev
+
+    return selected
+
+
+def minmax_indices(y, max_points):
+    """
+    Min / max bucketing: the lowest and highest point of each of
+    max_points // 2 equal-width buckets, plus the end points. Keeps every
+    spike, which LTTB can smooth away.
+    """
+    n = len(y)
+    if max_points >= n or max_points < 4:
+        return np.arange(n)
+
+    y = _as_float(y)
+    bucket = (np.arange(n) * (max_points // 2) // n)
+
+    # Within each bucket sorted by y, the first row is the min, the last
+    # the max
+    order = np.lexsort((y, bucket))
+    starts = np.flatnonzero(np.r_[True, bucket[order][1:] != bucket[order][:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    return np.unique(np.r_[0, order[starts], order[ends], n - 1])
+
+
+def decimate(df, x, y, max_points=None, method="lttb"):
+    """
+    Rows of df to plot for the x column against one or more y columns.
+    Returns df unchanged when max_points is None or the frame is already
+    small enough. With several y columns, the union of each column's
+    points is kept.
+    """
+    if max_points is None or len(df) <= max_points:
+        return df
+
+    if method not in ("lttb", "minmax"):
+        raise ValueError(f"Unknown decimation method: {method}")
+
+    df = df.sort_values(x)
+    columns = [y] if isinstance(y, str) else list(y)
+
+    keep = np.unique(np.concatenate([
+        lttb_indices(df[x].to_numpy(), df[c].to_numpy(), max_points)
+        if method == "lttb"
+        else minmax_indices(df[c].to_numpy(), max_points)
+        for c in columns
+    ]))
+
+    return df.iloc[keep]
+
+
+def render(fig, output=None, **write_kwargs):
+    """
+    Shows the figure, or writes it without opening a browser when output
+    is given: .html via write_html, anything else (.png, .svg, .pdf) via
+    write_image, which needs kaleido installed.
+    """
+    if output is None:
+        fig.show()
+        return fig
+
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    if output.suffix.lower() in (".html", ".htm"):
+        write_kwargs.setdefault("include_plotlyjs", "cdn")
+        fig.write_html(output, **write_kwargs)
+    else:
+        fig.write_image(output, **write_kwargs)
+
+    return fig
@@ -1,11 +1,21 @@
 import plotly.express as px
 
+from viq.plots.render import decimate, render
+
 
 class RollingPlots:
-    def __init__(self, df):
+    def __init__(self, df, max_points=None, method="lttb"):
+        # max_points opts in to decimating long series ("lttb" or "minmax")
         self.df = df
+        self.max_points = max_points
+        self.method = method
+
+    @classmethod
+    def from_cube(cls, cube, max_points=None, method="lttb", **filters):
+        # Plots daily totals of a SalesCube slice (machines, items, start, end)
+        return cls(cube.daily_totals(**filters), max_points, method)
 
-    def plot_rolling_7_day(self):
+    def plot_rolling_7_day(self, output=None):
         daily_totals = (
             self.df
             .groupby("Day", as_index=False)["Quantity"]
@@ -18,6 +28,15 @@ class RollingPlots:
             .mean()
         )
 
+        # Rolling mean is taken on the full series, only drawing is decimated
+        daily_totals = decimate(
+            daily_totals,
+            "Day",
+            ["Quantity", "Rolling_7_Day"],
+            self.max_points,
+            self.method
+        )
+
         fig = px.line(
             daily_totals,
             x="Day",
@@ -25,7 +44,7 @@ class RollingPlots:
             title="Daily Sales with Rolling 7-Day Average"
         )
 
-        fig.show()
+        return render(fig, output)
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
 import numpy as np
-from collections import Counter
 import math
+from statistics import NormalDist
 
 
 class MachineTimeToThreeOutsSimulation:
@@ -13,6 +13,9 @@ class MachineTimeToThreeOutsSimulation:
     - Days until 3 items run out
     - Days until cumulative sales reach vend_threshold
     - Whether 120 vends is even achievable before collapse
+
+    rng takes an int seed or a numpy Generator; the same seed gives the
+    same run.
     """
 
     def __init__(
@@ -20,7 +23,8 @@ class MachineTimeToThreeOutsSimulation:
         items,
         number_of_simulations,
         max_days=365,
-        vend_threshold=120
+        vend_threshold=120,
+        rng=None
     ):
         # Remove placeholder SKUs
         self.items = [
@@ -32,6 +36,8 @@ class MachineTimeToThreeOutsSimulation:
         self.max_days = max_days
         self.vend_threshold = vend_threshold
 
+        self.rng = np.random.default_rng(rng)
+
         # Convert item data to NumPy arrays for performance
         self.item_names = np.array(
             [item["item_name"] for item in self.items]
@@ -68,12 +74,12 @@ class MachineTimeToThreeOutsSimulation:
         hit_120_before_3 = 0
         hit_120_total = 0
 
-        out_counter = Counter()
+        out_counts = np.zeros(self.n_items, dtype=np.int64)
 
         for sim in range(sims):
 
             # Start fully stocked
-            fill_rate = np.random.normal(0.95, 0.03)
+            fill_rate = self.rng.normal(0.95, 0.03)
             fill_rate = np.clip(fill_rate, 0.80, 1.00)
             inventory = self.pars * fill_rate
             outs = np.zeros(self.n_items, dtype=bool)
@@ -85,7 +91,7 @@ class MachineTimeToThreeOutsSimulation:
             for day in range(1, max_days + 1):
 
                 # Generate daily demand per SKU
-                demand = np.random.normal(self.means, self.stds)
+                demand = self.rng.normal(self.means, self.stds)
                 demand = np.where(demand < 0, 0, demand)
 
                 # Sales limited by available inventory
@@ -97,10 +103,7 @@ class MachineTimeToThreeOutsSimulation:
                 # Detect newly exhausted SKUs
                 new_outs = (inventory <= 0) & (~outs)
 
-                if new_outs.any():
-                    indices = np.where(new_outs)[0]
-                    for idx in indices:
-                        out_counter[self.item_names[idx]] += 1
+                out_counts += new_outs
 
                 outs |= new_outs
 
@@ -134,6 +137,187 @@ class MachineTimeToThreeOutsSimulation:
 
             days_to_3_outs[sim] = day_3
 
+        return self._summarize(
+            days_to_3_outs,
+            days_to_120_vends,
+            vends_at_3_outs,
+            outs_at_120_vends,
+            hit_120_before_3,
+            hit_120_total,
+            out_counts
+        )
+
+    def run_batched(self):
+        """
+        Same model as run(), but every simulation is stepped forward
+        together on a (sims x items) inventory matrix. Simulations that
+        finish early are dropped from the active set.
+        """
+
+        return self._summarize(*self._run_batch(self.number_of_simulations))
+
+    def run_adaptive(
+        self,
+        target_half_width=0.5,
+        batch_size=1_000,
+        max_simulations=None,
+        confidence=0.95
+    ):
+        """
+        Runs batches of run_batched() until the confidence interval on
+        average days to 3 outs has the requested half-width in days (or
+        max_simulations is reached, default 10x number_of_simulations).
+        """
+
+        if max_simulations is None:
+            max_simulations = 10 * self.number_of_simulations
+
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+        batches = []
+        hit_120_before_3 = 0
+        hit_120_total = 0
+        out_counts = np.zeros(self.n_items, dtype=np.int64)
+        n = 0
+
+        while True:
+            size = min(batch_size, max_simulations - n)
+            batch = self._run_batch(size)
+
+            batches.append(batch[:4])
+            hit_120_before_3 += batch[4]
+            hit_120_total += batch[5]
+            out_counts += batch[6]
+            n += size
+
+            days_to_3_outs = np.concatenate([b[0] for b in batches])
+            mean = days_to_3_outs.mean()
+            half_width = (
+                z * days_to_3_outs.std(ddof=1) / np.sqrt(n) if n > 1 else np.inf
+            )
+
+            if half_width <= target_half_width or n >= max_simulations:
+                break
+
+        result = self._summarize(
+            days_to_3_outs,
+            np.concatenate([b[1] for b in batches]),
+            np.concatenate([b[2] for b in batches]),
+            np.concatenate([b[3] for b in batches]),
+            hit_120_before_3,
+            hit_120_total,
+            out_counts
+        )
+        result["days_to_3_outs_ci_low"] = float(mean - half_width)
+        result["days_to_3_outs_ci_high"] = float(mean + half_width)
+        result["simulations_used"] = n
+
+        return result
+
+    def _run_batch(self, sims):
+        max_days = self.max_days
+
+        days_to_3_outs = np.full(sims, max_days, dtype=float)
+        days_to_120_vends = np.full(sims, np.nan)
+
+        vends_at_3_outs = np.zeros(sims)
+        outs_at_120_vends = np.zeros(sims)
+
+        out_counts = np.zeros(self.n_items, dtype=np.int64)
+
+        # Start fully stocked
+        fill_rate = self.rng.normal(0.95, 0.03, size=sims)
+        fill_rate = np.clip(fill_rate, 0.80, 1.00)
+        inventory = fill_rate[:, None] * self.pars[None, :]
+        outs = np.zeros((sims, self.n_items), dtype=bool)
+
+        cumulative_sales = np.zeros(sims)
+        reached_3 = np.zeros(sims, dtype=bool)
+        reached_120 = np.zeros(sims, dtype=bool)
+
+        # Global simulation ids of the rows still being stepped
+        active = np.arange(sims)
+
+        for day in range(1, max_days + 1):
+
+            # Generate daily demand per simulation and SKU
+            demand = self.rng.normal(
+                self.means,
+                self.stds,
+                size=(active.size, self.n_items)
+            )
+            demand = np.where(demand < 0, 0, demand)
+
+            # Sales limited by available inventory
+            sold = np.minimum(demand, inventory)
+
+            inventory -= sold
+            cumulative_sales += sold.sum(axis=1)
+
+            # Detect newly exhausted SKUs, counted per item across sims
+            new_outs = (inventory <= 0) & (~outs)
+            out_counts += np.bincount(
+                np.nonzero(new_outs)[1],
+                minlength=self.n_items
+            )
+
+            outs |= new_outs
+            n_outs = outs.sum(axis=1)
+
+            # First time 3 items are out
+            hit_3 = ~reached_3 & (n_outs >= 3)
+            days_to_3_outs[active[hit_3]] = day
+            vends_at_3_outs[active[hit_3]] = cumulative_sales[hit_3]
+            reached_3 |= hit_3
+
+            # First time cumulative sales reach threshold
+            hit_120 = ~reached_120 & (cumulative_sales >= self.vend_threshold)
+            days_to_120_vends[active[hit_120]] = day
+            outs_at_120_vends[active[hit_120]] = n_outs[hit_120]
+            reached_120 |= hit_120
+
+            # Stop sims that are depleted or reached both milestones
+            keep = (inventory.sum(axis=1) > 0) & ~(reached_3 & reached_120)
+
+            if not keep.all():
+                active = active[keep]
+                inventory = inventory[keep]
+                outs = outs[keep]
+                cumulative_sales = cumulative_sales[keep]
+                reached_3 = reached_3[keep]
+                reached_120 = reached_120[keep]
+
+            if active.size == 0:
+                break
+
+        hit_120 = ~np.isnan(days_to_120_vends)
+        hit_120_total = int(hit_120.sum())
+        hit_120_before_3 = int(
+            (days_to_120_vends[hit_120] <= days_to_3_outs[hit_120]).sum()
+        )
+
+        return (
+            days_to_3_outs,
+            days_to_120_vends,
+            vends_at_3_outs,
+            outs_at_120_vends,
+            hit_120_before_3,
+            hit_120_total,
+            out_counts
+        )
+
+    def _summarize(
+        self,
+        days_to_3_outs,
+        days_to_120_vends,
+        vends_at_3_outs,
+        outs_at_120_vends,
+        hit_120_before_3,
+        hit_120_total,
+        out_counts
+    ):
+        sims = len(days_to_3_outs)
+
         # Determine correct reporting for 120 vends
         if hit_120_total == 0:
             avg_days_to_120 = "Cannot reach 120 vends between services"
@@ -143,10 +327,12 @@ class MachineTimeToThreeOutsSimulation:
             avg_outs_at_120 = int(np.ceil(np.nanmean(outs_at_120_vends)))
 
         # Compute item-level out probabilities
-        item_out_percentages = {
-            item: count / sims
-            for item, count in out_counter.items()
-        }
+        item_out_percentages = {}
+        for item, count in zip(self.item_names, out_counts):
+            if count > 0:
+                item_out_percentages[item] = (
+                    item_out_percentages.get(item, 0) + count / sims
+                )
 
         top_10_out_items = dict(
             sorted(
@@ -1,15 +1,20 @@
 import pandas as pd
 import plotly.graph_objects as go
 
+from viq.plots.render import decimate, render
 
-def plot_simulation_timeseries(csv_path):
-    df = pd.read_csv(csv_path)
+
+def plot_simulation_timeseries(csv_path, max_points=None, method="minmax", output=None):
+    # max_points decimates long runs (minmax keeps the extreme runs visible);
+    # output writes .html / .png etc. instead of opening a browser
+    df = pd.read_csv(csv_path, usecols=["simulation_id", "days_to_3_outs"])
     df = df.sort_values("simulation_id")
+    df = decimate(df, "simulation_id", "days_to_3_outs", max_points, method)
 
     fig = go.Figure()
 
     fig.add_trace(
-        go.Scatter(
+        go.Scattergl(
             x=df["simulation_id"],
             y=df["days_to_3_outs"],
             mode="lines",
@@ -24,10 +29,11 @@ def plot_simulation_timeseries(csv_path):
         hovermode="x unified"
     )
 
-    fig.show()
+    return render(fig, output)
 
 
 if __name__ == "__main__":
     plot_simulation_timeseries(
-        "machine_time_to_3_outs_simulations.csv"
+        "machine_time_to_3_outs_simulations.csv",
+        max_points=2_000
     )
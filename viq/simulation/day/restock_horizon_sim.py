@@ -0,0 +1,267 @@
+import numpy as np
+import pandas as pd
+
+
+class RestockHorizonSimulation:
+    """
+    Simulates a machine over a planning horizon of many service visits.
+
+    - Starts at par on day 0
+    - Daily demand per SKU is negative binomial (Poisson when
+      variance <= mean), lost when the SKU is empty
+    - The pick list is built lead_time_days before each visit from the
+      inventory at that time (par - on hand); the visit adds it, so demand
+      during the lead time is not replaced until the next visit
+    - Leftover inventory carries over between visits
+
+    Every simulation and SKU is stepped forward together on a
+    (sims x items) inventory matrix. Fix rng (seed or Generator) to
+    repeat a run.
+
+    Tracks, per visit and per month:
+    - Vends and lost sales
+    - Outs (SKUs empty when the driver arrives)
+    """
+
+    def __init__(
+        self,
+        items,
+        number_of_simulations,
+        visit_schedule=7,
+        lead_time_days=1,
+        horizon_days=360,
+        days_per_month=30,
+        rng=None
+    ):
+        # Remove placeholder SKUs
+        self.items = [
+            item for item in items
+            if not item["item_name"].lower().startswith("zz")
+        ]
+
+        self.number_of_simulations = number_of_simulations
+        self.lead_time_days = lead_time_days
+        self.horizon_days = horizon_days
+        self.days_per_month = days_per_month
+
+        self.rng = np.random.default_rng(rng)
+
+        # Every N days, or explicit visit days (1..horizon_days)
+        if np.isscalar(visit_schedule):
+            visit_days = np.arange(visit_schedule, horizon_days + 1, visit_schedule)
+        else:
+            visit_days = np.unique(np.asarray(visit_schedule, dtype=int))
+
+        visit_days = visit_days[(visit_days >= 1) & (visit_days <= horizon_days)]
+
+        gaps = np.diff(np.r_[0, visit_days])
+        if len(visit_days) and lead_time_days >= gaps.min():
+            raise ValueError(
+                "lead_time_days must be shorter than the gap between visits"
+            )
+
+        self.visit_days = visit_days
+
+        self.item_names = np.array(
+            [item["item_name"] for item in self.items]
+        )
+
+        self.means = np.array(
+            [item["avg_daily_sales"] for item in self.items],
+            dtype=float
+        )
+
+        self.stds = np.array(
+            [item["daily_std"] for item in self.items],
+            dtype=float
+        )
+
+        self.pars = np.array(
+            [item["par_level"] for item in self.items],
+            dtype=np.int32
+        )
+
+        self.n_items = len(self.items)
+
+        # Negative binomial where overdispersed, Poisson otherwise (and
+        # for zero-mean SKUs, which would give p = 0)
+        var = self.stds ** 2
+        self.negbin = (var > self.means) & (self.means > 0)
+        self.r = np.where(
+            self.negbin,
+            self.means ** 2 / np.where(self.negbin, var - self.means, 1.0),
+            1.0
+        )
+        self.p = np.where(self.negbin, self.r / (self.r + self.means), 0.5)
+
+    def _sample_demand(self, sims):
+        demand = np.empty((sims, self.n_items), dtype=np.int32)
+
+        nb = self.negbin
+        demand[:, nb] = self.rng.negative_binomial(
+            self.r[nb], self.p[nb], size=(sims, nb.sum())
+        )
+        demand[:, ~nb] = self.rng.poisson(
+            self.means[~nb], size=(sims, (~nb).sum())
+        )
+
+        return demand
+
+    def run(self):
+        sims = self.number_of_simulations
+        n_visits = len(self.visit_days)
+        n_months = -(-self.horizon_days // self.days_per_month)
+
+        inventory = np.broadcast_to(self.pars, (sims, self.n_items)).copy()
+        pick_list = np.zeros_like(inventory)
+
+        # Per sim, per visit: what the driver finds on arrival
+        vends_per_visit = np.zeros((sims, n_visits), dtype=np.int32)
+        lost_per_visit = np.zeros((sims, n_visits), dtype=np.int32)
+        outs_per_visit = np.zeros((sims, n_visits), dtype=np.int32)
+
+        monthly_vends = np.zeros((sims, n_months), dtype=np.int64)
+        monthly_lost = np.zeros((sims, n_months), dtype=np.int64)
+
+        lost_by_item = np.zeros(self.n_items, dtype=np.int64)
+
+        cycle_vends = np.zeros(sims, dtype=np.int32)
+        cycle_lost = np.zeros(sims, dtype=np.int32)
+
+        visit_of_day = {day: k for k, day in enumerate(self.visit_days)}
+        order_days = {day - self.lead_time_days for day in self.visit_days}
+
+        for day in range(1, self.horizon_days + 1):
+
+            # Pick list is built from inventory lead_time_days ahead
+            if day in order_days:
+                pick_list = self.pars - inventory
+
+            # Visit at the start of the day: record, then restock
+            k = visit_of_day.get(day)
+            if k is not None:
+                outs_per_visit[:, k] = (inventory == 0).sum(axis=1)
+                vends_per_visit[:, k] = cycle_vends
+                lost_per_visit[:, k] = cycle_lost
+
+                inventory += pick_list
+                cycle_vends[:] = 0
+                cycle_lost[:] = 0
+
+            demand = self._sample_demand(sims)
+
+            # Sales limited by available inventory, the rest is lost
+            sold = np.minimum(demand, inventory)
+            lost = demand - sold
+            inventory -= sold
+
+            sold_total = sold.sum(axis=1)
+            lost_total = lost.sum(axis=1)
+
+            cycle_vends += sold_total
+            cycle_lost += lost_total
+
+            month = (day - 1) // self.days_per_month
+            monthly_vends[:, month] += sold_total
+            monthly_lost[:, month] += lost_total
+
+            lost_by_item += lost.sum(axis=0)
+
+        return self._summarize(
+            vends_per_visit,
+            lost_per_visit,
+            outs_per_visit,
+            monthly_vends,
+            monthly_lost,
+            lost_by_item
+        )
+
+    def _summarize(
+        self,
+        vends_per_visit,
+        lost_per_visit,
+        outs_per_visit,
+        monthly_vends,
+        monthly_lost,
+        lost_by_item
+    ):
+        sims = len(monthly_vends)
+        n_months = monthly_vends.shape[1]
+
+        visit_month = (self.visit_days - 1) // self.days_per_month
+        visits_in_month = np.bincount(visit_month, minlength=n_months)
+
+        def per_month(per_visit):
+            # Average over sims and over the visits falling in each month
+            totals = np.bincount(
+                visit_month,
+                weights=per_visit.mean(axis=0),
+                minlength=n_months
+            )
+            return np.divide(
+                totals,
+                visits_in_month,
+                out=np.full(n_months, np.nan),
+                where=visits_in_month > 0
+            )
+
+        demand = monthly_vends + monthly_lost
+
+        monthly = pd.DataFrame({
+            "month": np.arange(1, n_months + 1),
+            "visits": visits_in_month,
+            "avg_vends": monthly_vends.mean(axis=0),
+            "avg_lost_sales": monthly_lost.mean(axis=0),
+            "lost_sales_rate": monthly_lost.sum(axis=0) / np.maximum(demand.sum(axis=0), 1),
+            "avg_vends_per_visit": per_month(vends_per_visit),
+            "avg_outs_per_visit": per_month(outs_per_visit),
+            "p90_outs_per_visit": [
+                np.percentile(outs_per_visit[:, visit_month == m], 90)
+                if visits_in_month[m] else np.nan
+                for m in range(n_months)
+            ]
+        })
+
+        items = pd.DataFrame({
+            "item_name": self.item_names,
+            "par_level": self.pars,
+            "avg_lost_sales_per_month": lost_by_item / sims / (self.horizon_days / self.days_per_month)
+        }).sort_values("avg_lost_sales_per_month", ascending=False, ignore_index=True)
+
+        n_visits = len(self.visit_days)
+
+        return {
+            "visits": n_visits,
+            "avg_vends_per_visit": float(vends_per_visit.mean()) if n_visits else 0.0,
+            "avg_lost_sales_per_visit": float(lost_per_visit.mean()) if n_visits else 0.0,
+            "avg_outs_per_visit": float(outs_per_visit.mean()) if n_visits else 0.0,
+            "lost_sales_rate": float(monthly_lost.sum() / max(demand.sum(), 1)),
+            "avg_vends_per_month": float(monthly_vends.sum(axis=1).mean() / (self.horizon_days / self.days_per_month)),
+            "monthly": monthly,
+            "items": items
+        }
+
+
+def compare_visit_schedules(items, schedules, number_of_simulations, rng=None, **kwargs):
+    """
+    Runs RestockHorizonSimulation once per visit schedule (e.g. every 7,
+    10, 14 days) and returns one summary row per schedule.
+    """
+    rng = np.random.default_rng(rng)
+    rows = []
+
+    for schedule in schedules:
+        result = RestockHorizonSimulation(
+            items=items,
+            number_of_simulations=number_of_simulations,
+            visit_schedule=schedule,
+            rng=rng,
+            **kwargs
+        ).run()
+
+        rows.append({
+            "visit_schedule": schedule,
+            **{k: v for k, v in result.items() if k not in ("monthly", "items")}
+        })
+
+    return pd.DataFrame(rows)
@@ -1,9 +1,12 @@
+# From the repo root: python -m viq.simulation.day.run_machine_time_to_3_outs
+
 import numpy as np
 import pandas as pd
 from colorama import Fore, Style, init
 
-from machine_time_to_3_outs_sim import MachineTimeToThreeOutsSimulation
-from stats_utils import get_month_columns, daily_stats_since_launch
+from viq.Load.cache import read_excel_cached
+from viq.simulation.day.machine_time_to_3_outs_sim import MachineTimeToThreeOutsSimulation
+from viq.simulation.day.stats_utils import get_month_columns, daily_stats_table
 
 init(autoreset=True)
 
@@ -11,9 +14,10 @@ if __name__ == "__main__":
 
     DAYS_PER_MONTH = 30
     SIMS = 10_000
+    SEED = 42
 
-    df_sales = pd.read_excel("/Users/andrewleacock1/Downloads/4427.xlsx", header=12)
-    df_par  =  pd.read_excel("/Users/andrewleacock1/Downloads/4427_par.xlsx", header=12)
+    df_sales = read_excel_cached("/Users/andrewleacock1/Downloads/4427.xlsx", header=12)
+    df_par  =  read_excel_cached("/Users/andrewleacock1/Downloads/4427_par.xlsx", header=12)
 
     month_columns = get_month_columns(df_sales)
 
@@ -26,45 +30,37 @@ if __name__ == "__main__":
 
     par_lookup = df_par.set_index("Item Name")[par_col]
 
-    items = []
-    for _, row in df_sales.iterrows():
-        item = row["Item Name"]
-
-        if not isinstance(item, str) or item.lower().startswith("zz"):
-            continue
-        if item not in par_lookup:
-            continue
-
-        mean, std = daily_stats_since_launch(
-            row, month_columns, DAYS_PER_MONTH
-        )
+    stats = daily_stats_table(df_sales, month_columns, DAYS_PER_MONTH)
+    mean = stats["weighted_mean"]
+    std = stats["weighted_std"]
+    par = df_sales["Item Name"].map(par_lookup)
+
+    names = df_sales["Item Name"]
+    valid = (
+        names.apply(lambda x: isinstance(x, str))
+        & ~names.astype(str).str.lower().str.startswith("zz")
+        & names.isin(par_lookup.index)
+        & np.isfinite(mean)
+        & np.isfinite(std)
+        & (mean > 0)
+        & np.isfinite(par.astype(float))
+        & (par > 0)
+    )
 
-        if (
-            mean is None
-            or std is None
-            or not np.isfinite(mean)
-            or not np.isfinite(std)
-            or mean <= 0
-        ):
-            continue
-
-        par = par_lookup[item]
-        if not np.isfinite(par) or par <= 0:
-            continue
-
-        items.append({
-            "item_name": item,
-            "avg_daily_sales": float(mean),
-            "daily_std": float(std),
-            "par_level": int(par)
-        })
+    items = pd.DataFrame({
+        "item_name": names[valid],
+        "avg_daily_sales": mean[valid].astype(float),
+        "daily_std": std[valid].astype(float),
+        "par_level": par[valid].astype(int)
+    }).to_dict("records")
 
     sim = MachineTimeToThreeOutsSimulation(
         items=items,
-        number_of_simulations=SIMS
+        number_of_simulations=SIMS,
+        rng=SEED
     )
 
-    result = sim.run()
+    result = sim.run_batched()
 
     print(Fore.CYAN + "=" * 60)
     print(Fore.CYAN + Style.BRIGHT + "MACHINE TIME / SALES / OUTS")
@@ -132,8 +128,9 @@ import numpy as np
 import pandas as pd
 from colorama import Fore, Style, init
 
-from machine_time_to_3_outs_sim import MachineTimeToThreeOutsSimulation
-from stats_utils import get_month_columns
+from viq.Load.cache import read_excel_cached
+from viq.simulation.day.machine_time_to_3_outs_sim import MachineTimeToThreeOutsSimulation
+from viq.simulation.day.stats_utils import get_month_columns, daily_stats_table
 
 init(autoreset=True)
 
@@ -141,9 +138,10 @@ if __name__ == "__main__":
 
     DAYS_PER_MONTH = 30
     SIMS = 10_000
+    SEED = 42
 
-    df_sales = pd.read_excel("/Users/andrewleacock1/Downloads/12718.xlsx", header=12)
-    df_par   = pd.read_excel("/Users/andrewleacock1/Downloads/12718_par.xlsx", header=12)
+    df_sales = read_excel_cached("/Users/andrewleacock1/Downloads/12718.xlsx", header=12)
+    df_par   = read_excel_cached("/Users/andrewleacock1/Downloads/12718_par.xlsx", header=12)
 
     month_columns = get_month_columns(df_sales)
 
@@ -167,33 +165,13 @@ if __name__ == "__main__":
         how="inner"
     )
 
-    # Convert month columns to numeric once
-    df[month_columns] = df[month_columns].apply(
-        pd.to_numeric, errors="coerce"
-    ).fillna(0.0)
+    # Daily stats for every row in one pass
+    stats = daily_stats_table(df, month_columns, DAYS_PER_MONTH)
 
-    # Find first nonzero month index per row
-    first_nonzero = (df[month_columns] > 0).idxmax(axis=1)
-
-    # Compute daily arrays vectorized
-    means = []
-    stds = []
-
-    for idx, row in df.iterrows():
-        monthly = row[month_columns].values.astype(float)
-        nonzero_index = np.argmax(monthly > 0)
-
-        if monthly[nonzero_index] <= 0:
-            means.append(np.nan)
-            stds.append(np.nan)
-            continue
-
-        daily = monthly[nonzero_index:] / DAYS_PER_MONTH
-        means.append(daily.mean())
-        stds.append(daily.std(ddof=1))
-
-    df["avg_daily_sales"] = means
-    df["daily_std"] = stds
+    df["avg_daily_sales"] = stats["avg_daily_sales"].where(
+        stats["first_sale_idx"] >= 0
+    )
+    df["daily_std"] = stats["daily_std"].where(stats["first_sale_idx"] >= 0)
 
     # Final clean filter
     df = df[
@@ -215,7 +193,8 @@ if __name__ == "__main__":
 
     sim = MachineTimeToThreeOutsSimulation(
         items=items,
-        number_of_simulations=SIMS
+        number_of_simulations=SIMS,
+        rng=SEED
     )
 
-    result = sim.run()
+    result = sim.run_batched()
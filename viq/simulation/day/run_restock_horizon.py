@@ -0,0 +1,120 @@
+# From the repo root: python -m viq.simulation.day.run_restock_horizon
+
+import numpy as np
+import pandas as pd
+from colorama import Fore, Style, init
+
+from viq.Load.cache import read_excel_cached
+from viq.simulation.day.restock_horizon_sim import compare_visit_schedules, RestockHorizonSimulation
+from viq.simulation.day.stats_utils import get_month_columns, daily_stats_table
+
+init(autoreset=True)
+
+if __name__ == "__main__":
+
+    DAYS_PER_MONTH = 30
+    SIMS = 5_000
+    SEED = 42
+
+    HORIZON_DAYS = 360
+    LEAD_TIME_DAYS = 1
+    VISIT_INTERVALS = [7, 10, 14, 21]
+
+    df_sales = read_excel_cached("/Users/andrewleacock1/Downloads/12718.xlsx", header=12)
+    df_par   = read_excel_cached("/Users/andrewleacock1/Downloads/12718_par.xlsx", header=12)
+
+    month_columns = get_month_columns(df_sales)
+
+    if "Vending Par Level" in df_par.columns:
+        par_col = "Vending Par Level"
+    elif "MM Par" in df_par.columns:
+        par_col = "MM Par"
+    else:
+        raise ValueError("Missing par column")
+
+    df_sales = df_sales[
+        df_sales["Item Name"].notna()
+        & ~df_sales["Item Name"].str.lower().str.startswith("zz")
+    ]
+
+    df = df_sales.merge(
+        df_par[["Item Name", par_col]],
+        on="Item Name",
+        how="inner"
+    )
+
+    # Daily stats for every row in one pass
+    stats = daily_stats_table(df, month_columns, DAYS_PER_MONTH)
+
+    df["avg_daily_sales"] = stats["avg_daily_sales"].where(
+        stats["first_sale_idx"] >= 0
+    )
+    df["daily_std"] = stats["daily_std"].fillna(0.0)
+
+    df = df[
+        np.isfinite(df["avg_daily_sales"])
+        & (df["avg_daily_sales"] > 0)
+        & (df[par_col] > 0)
+    ]
+
+    items = df[[
+        "Item Name",
+        "avg_daily_sales",
+        "daily_std",
+        par_col
+    ]].rename(columns={
+        "Item Name": "item_name",
+        par_col: "par_level"
+    }).to_dict("records")
+
+    comparison = compare_visit_schedules(
+        items,
+        VISIT_INTERVALS,
+        number_of_simulations=SIMS,
+        rng=SEED,
+        lead_time_days=LEAD_TIME_DAYS,
+        horizon_days=HORIZON_DAYS,
+        days_per_month=DAYS_PER_MONTH
+    )
+
+    print(Fore.CYAN + "=" * 60)
+    print(Fore.CYAN + Style.BRIGHT + "SERVICE FREQUENCY COMPARISON")
+    print(Fore.CYAN + "=" * 60)
+
+    for row in comparison.itertuples(index=False):
+        print(
+            f"{Style.BRIGHT}{Fore.CYAN}Every {row.visit_schedule:>2} days  "
+            f"{Fore.WHITE}Vends/visit: {Fore.YELLOW}{row.avg_vends_per_visit:>7.1f}  "
+            f"{Fore.WHITE}Outs/visit: {Fore.YELLOW}{row.avg_outs_per_visit:>5.1f}  "
+            f"{Fore.WHITE}Lost sales: {Fore.YELLOW}{row.lost_sales_rate:.1%}"
+        )
+
+    result = RestockHorizonSimulation(
+        items=items,
+        number_of_simulations=SIMS,
+        visit_schedule=VISIT_INTERVALS[0],
+        lead_time_days=LEAD_TIME_DAYS,
+        horizon_days=HORIZON_DAYS,
+        days_per_month=DAYS_PER_MONTH,
+        rng=SEED
+    ).run()
+
+    print(Fore.CYAN + "=" * 60)
+    print(Fore.CYAN + Style.BRIGHT + f"BY MONTH (EVERY {VISIT_INTERVALS[0]} DAYS)")
+    print(Fore.CYAN + "=" * 60)
+
+    with pd.option_context("display.float_format", "{:,.2f}".format):
+        print(result["monthly"].to_string(index=False))
+
+    print(Fore.CYAN + "=" * 60)
+    print(Fore.CYAN + Style.BRIGHT + "TOP LOST SALES ITEMS (PER MONTH)")
+    print(Fore.CYAN + "=" * 60)
+
+    for i, row in enumerate(result["items"].head(10).itertuples(index=False), 1):
+        print(
+            f"{Style.BRIGHT}{Fore.CYAN}{i:>2}. "
+            f"{Fore.WHITE}{row.item_name:<30} "
+            f"{Style.BRIGHT}{Fore.YELLOW}{row.avg_lost_sales_per_month:.1f}"
+        )
+
+    print(Fore.CYAN + "=" * 60)
@@ -1,5 +1,8 @@
 import numpy as np
-from daily_demand import DailyDemand
+
+from viq.analysis.stats import wilson_interval
+from viq.simulation.negative_binomial.daily_demand import DailyDemand
+from viq.simulation.negative_binomial.results import AssetSimulationResult
 
 
 class AssetSimulation:
@@ -11,7 +14,9 @@ class AssetSimulation:
         days_between_visits,
         lead_time_days,
         par_level,
-        number_of_simulations
+        number_of_simulations,
+        sample_storage="array",
+        rng=None
     ):
         self.item_name = item_name
         self.days_between_visits = days_between_visits
@@ -19,8 +24,13 @@ class AssetSimulation:
         self.par_level = int(par_level)
         self.number_of_simulations = number_of_simulations
 
+        # "array" keeps every cycle total, "histogram" only their counts,
+        # None drops them after summarizing
+        self.sample_storage = sample_storage
+
         # DailyDemand.sample() RETURNS AN INT (rounded up or down stochastically)
-        self.demand = DailyDemand(avg_daily_sales, daily_std)
+        self.rng = np.random.default_rng(rng)
+        self.demand = DailyDemand(avg_daily_sales, daily_std, rng=self.rng)
         self.avg_daily_sales = avg_daily_sales
         self.daily_std = daily_std
 
@@ -30,7 +40,16 @@ class AssetSimulation:
             return 0
 
         base = int(np.floor(x))
-        return base + (np.random.rand() < (x - base))
+        return base + (self.rng.random() < (x - base))
+
+    def _effective_inventories(self, size):
+        # Same stochastic rounding as _effective_inventory, one per simulation
+        x = self.par_level - (self.avg_daily_sales * self.lead_time_days)
+        if x <= 0:
+            return np.zeros(size, dtype=np.int64)
+
+        base = int(np.floor(x))
+        return base + (self.rng.random(size) < (x - base))
 
     def run(self):
         cycle_totals = []
@@ -54,19 +73,142 @@ class AssetSimulation:
 
         cycle_totals = np.array(cycle_totals)
 
-        return {
-            "item_name": self.item_name,
-            "avg_daily_sales": round(self.avg_daily_sales, 4),
-            "daily_std": round(self.daily_std, 4),
+        return self._summarize(cycle_totals, effective_inventories, stockouts)
+
+    def run_batched(self):
+        return self._summarize(*self._run_batch(self.number_of_simulations))
+
+    def _run_batch(self, sims):
+        effective_inventories = self._effective_inventories(sims)
+
+        # (simulations x days) demand matrix, INTEGER SALES ONLY
+        demand = self.demand.sample(size=(sims, self.days_between_visits))
+        cycle_totals = demand.sum(axis=1)
+
+        stockouts = int(np.count_nonzero(cycle_totals > effective_inventories))
+
+        return cycle_totals, effective_inventories, stockouts
+
+    def run_adaptive(
+        self,
+        target_half_width=0.005,
+        batch_size=1_000,
+        max_simulations=None,
+        confidence=0.95
+    ):
+        """
+        Runs batches until the confidence interval on the stockout
+        probability has the requested half-width (or max_simulations is
+        reached, default 10x number_of_simulations).
+        """
+        if max_simulations is None:
+            max_simulations = 10 * self.number_of_simulations
+
+        totals, inventories = [], []
+        stockouts = 0
+        n = 0
+
+        while True:
+            size = min(batch_size, max_simulations - n)
+            cycle_totals, effective_inventories, batch_stockouts = (
+                self._run_batch(size)
+            )
+
+            totals.append(cycle_totals)
+            inventories.append(effective_inventories)
+            stockouts += batch_stockouts
+            n += size
+
+            low, high = wilson_interval(stockouts, n, confidence)
+            if (high - low) / 2 <= target_half_width or n >= max_simulations:
+                break
+
+        result = self._summarize(
+            np.concatenate(totals),
+            np.concatenate(inventories),
+            stockouts
+        )
+        result.stockout_ci_low = low
+        result.stockout_ci_high = high
+        result.simulations_used = n
+
+        return result
+
+    def analytic(self, cross_check=False):
+        """
+        Closed-form version of run(): cycle demand is NB(r * days, p) (or
+        Poisson(avg * days)), and the stochastic rounding of the effective
+        inventory is a two-point mixture, so no sampling is needed.
+        """
+        cdf = np.cumsum(self.demand.cycle_pmf(self.days_between_visits))
+
+        def p_more_than(k):
+            return float(max(1 - cdf[k], 0.0)) if k < len(cdf) else 0.0
+
+        x = self.par_level - (self.avg_daily_sales * self.lead_time_days)
+        if x <= 0:
+            effective_inventory = 0
+            stockout_probability = p_more_than(0)
+        else:
+            base = int(np.floor(x))
+            frac = x - base
+            effective_inventory = int(round(x))
+            stockout_probability = (
+                (1 - frac) * p_more_than(base)
+                + frac * p_more_than(base + 1)
+            )
+
+        result = AssetSimulationResult(
+            item_name=self.item_name,
+            avg_daily_sales=round(self.avg_daily_sales, 4),
+            daily_std=round(self.daily_std, 4),
+
+            # ALL INTEGERS
+            p95_cycle_demand=int(np.searchsorted(cdf, 0.95)),
+            avg_cycle_demand=int(
+                round(self.avg_daily_sales * self.days_between_visits)
+            ),
+            effective_inventory=effective_inventory,
+
+            availability=1 - stockout_probability,
+            stockout_probability=stockout_probability,
+            current_par_level=self.par_level
+        )
+
+        if cross_check:
+            simulated = self.run_batched()
+            result.simulated_p95_cycle_demand = simulated.p95_cycle_demand
+            result.simulated_stockout_probability = (
+                simulated.stockout_probability
+            )
+
+        return result
+
+    def _summarize(self, cycle_totals, effective_inventories, stockouts):
+        n = len(cycle_totals)
+        cycle_totals = np.asarray(cycle_totals, dtype=np.int32)
+
+        simulated_sales = None
+        histogram = None
+        if self.sample_storage == "array":
+            simulated_sales = cycle_totals
+        elif self.sample_storage == "histogram":
+            histogram = np.bincount(cycle_totals)
+
+        return AssetSimulationResult(
+            item_name=self.item_name,
+            avg_daily_sales=round(self.avg_daily_sales, 4),
+            daily_std=round(self.daily_std, 4),
 
             # ALL INTEGERS
-            "p95_cycle_demand": int(np.percentile(cycle_totals, 95)),
-            "avg_cycle_demand": int(round(np.mean(cycle_totals))),
-            "effective_inventory": int(round(np.mean(effective_inventories))),
+            p95_cycle_demand=int(np.percentile(cycle_totals, 95)),
+            avg_cycle_demand=int(round(np.mean(cycle_totals))),
+            effective_inventory=int(round(np.mean(effective_inventories))),
 
-            "availability": 1 - stockouts / self.number_of_simulations,
-            "stockout_probability": stockouts / self.number_of_simulations,
-            "current_par_level": self.par_level,
+            availability=1 - stockouts / n,
+            stockout_probability=stockouts / n,
+            current_par_level=self.par_level,
 
-            "simulated_sales": cycle_totals.tolist()
-        }
+            simulated_sales=simulated_sales,
+            histogram=histogram
+        )
@@ -3,10 +3,13 @@ import numpy as np
 
 
 class DailyDemand:
-    def __init__(self, avg_daily_sales, daily_std):
+    def __init__(self, avg_daily_sales, daily_std, rng=None):
         self.avg = avg_daily_sales
         self.std = daily_std
 
+        # AssetSimulation hands over its Generator so both share one stream
+        self.rng = np.random.default_rng(rng)
+
         var = daily_std ** 2
         if var > avg_daily_sales and avg_daily_sales > 0:
             self.r = (avg_daily_sales ** 2) / (var - avg_daily_sales)
@@ -15,7 +18,37 @@ class DailyDemand:
         else:
             self.use_negbin = False
 
-    def sample(self):
+    def sample(self, size=None):
+        if self.use_negbin:
+            return self.rng.negative_binomial(self.r, self.p, size=size)
+        return self.rng.poisson(self.avg, size=size)
+
+    def cycle_pmf(self, days):
+        """
+        Exact pmf of total demand over `days` i.i.d. days, over 0..k_max.
+        The sum is NB(r * days, p), or Poisson(avg * days) when the
+        Poisson fallback is in use.
+        """
+        if self.use_negbin:
+            n = self.r * days
+            mean = n * (1 - self.p) / self.p
+            var = mean / self.p
+        else:
+            mean = var = self.avg * days
+
+        if mean <= 0:
+            return np.ones(1)
+
+        k_max = int(np.ceil(mean + 12 * np.sqrt(var) + 20))
+        k = np.arange(k_max)
+
+        # log pmf(0), then the pmf(k + 1) / pmf(k) ratios, accumulated
         if self.use_negbin:
-            return np.random.negative_binomial(self.r, self.p)
-        return np.random.poisson(self.avg)
+            log_pmf_0 = n * np.log(self.p)
+            log_ratio = np.log((k + n) / (k + 1) * (1 - self.p))
+        else:
+            log_pmf_0 = -mean
+            log_ratio = np.log(mean / (k + 1))
+
+        log_pmf = np.concatenate(([log_pmf_0], log_pmf_0 + np.cumsum(log_ratio)))
+        return np.exp(log_pmf)
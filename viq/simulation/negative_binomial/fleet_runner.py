@@ -0,0 +1,152 @@
+# fleet_runner.py
+# From the repo root: python -m viq.simulation.negative_binomial.fleet_runner
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from viq.Load.cache import read_excel_cached
+from viq.simulation.negative_binomial.machine_sim import MachineSimulation, machine_item_table
+
+
+def discover_machines(directory):
+    """
+    Finds "<machine>.xlsx" / "<machine>_par.xlsx" pairs in a directory.
+    Machines missing either workbook are skipped.
+    """
+    directory = Path(directory)
+    pairs = []
+
+    for par_path in sorted(directory.glob("*_par.xlsx")):
+        machine_id = par_path.name[: -len("_par.xlsx")]
+        sales_path = directory / f"{machine_id}.xlsx"
+
+        if sales_path.exists():
+            pairs.append((machine_id, sales_path, par_path))
+
+    return pairs
+
+
+def _run_machine(job):
+    machine_id, sales_path, par_path, config, seed = job
+
+    try:
+        df_main = read_excel_cached(sales_path, cache_dir=config["cache_dir"], header=12)
+        df_par = read_excel_cached(par_path, cache_dir=config["cache_dir"], header=12)
+
+        items = machine_item_table(df_main, df_par, config["days_per_month"])
+
+        sim = MachineSimulation(
+            item_names=items["Item Name"].values,
+            avg_daily_sales=items["avg_daily_sales"].values,
+            daily_std=items["daily_std"].values,
+            par_levels=items["par_level"].values,
+            capacities=items["capacity"].values,
+            days_between_visits=config["days_between_visits"],
+            lead_time_days=config["lead_time_days"],
+            number_of_simulations=config["number_of_simulations"],
+            rng=seed
+        )
+
+        df = sim.run()
+        df.insert(0, "machine_id", machine_id)
+        return machine_id, df, None
+
+    except Exception as e:
+        return machine_id, None, str(e)
+
+
+def run_fleet(
+    pairs,
+    days_per_month=20,
+    days_between_visits=20,
+    lead_time_days=2,
+    number_of_simulations=10_000,
+    max_workers=None,
+    seed=None,
+    cache_dir=None
+):
+    """
+    Runs MachineSimulation for every (machine_id, sales_path, par_path)
+    pair on a process pool.
+
+    Each machine gets its own child of one SeedSequence, so streams are
+    independent across workers and a given seed reproduces the run
+    regardless of worker count.
+
+    Workbooks go through read_excel_cached in cache_dir (the default
+    cache when None).
+
+    Returns (results, failures): one DataFrame for the whole fleet and a
+    dict of machine_id -> error message.
+    """
+    config = {
+        "days_per_month": days_per_month,
+        "days_between_visits": days_between_visits,
+        "lead_time_days": lead_time_days,
+        "number_of_simulations": number_of_simulations,
+        "cache_dir": cache_dir
+    }
+
+    seeds = np.random.SeedSequence(seed).spawn(len(pairs))
+
+    jobs = [
+        (machine_id, sales_path, par_path, config, child)
+        for (machine_id, sales_path, par_path), child in zip(pairs, seeds)
+    ]
+
+    frames = []
+    failures = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for machine_id, df, error in pool.map(_run_machine, jobs):
+            if error is not None:
+                failures[machine_id] = error
+            elif not df.empty:
+                frames.append(df)
+
+    if not frames:
+        return pd.DataFrame(), failures
+
+    results = pd.concat(frames, ignore_index=True)
+    results["machine_id"] = results["machine_id"].astype("category")
+
+    return results, failures
+
+
+def write_fleet_results(results, path):
+    results.to_parquet(path, index=False)
+
+
+if __name__ == "__main__":
+
+    DAYS_PER_MONTH = 20
+    DAYS_BETWEEN_VISITS = 20
+    LEAD_TIME_DAYS = 2
+    SIMS = 10_000
+    SEED = 42
+
+    pairs = discover_machines("/Users/andrewleacock1/Downloads")
+
+    results, failures = run_fleet(
+        pairs,
+        days_per_month=DAYS_PER_MONTH,
+        days_between_visits=DAYS_BETWEEN_VISITS,
+        lead_time_days=LEAD_TIME_DAYS,
+        number_of_simulations=SIMS,
+        max_workers=os.cpu_count(),
+        seed=SEED
+    )
+
+    for machine_id, error in failures.items():
+        print(f"Skipped {machine_id}: {error}")
+
+    write_fleet_results(
+        results,
+        "/Users/andrewleacock1/Downloads/fleet_sim_results.parquet"
+    )
+
+    print(f"Simulated {results['machine_id'].nunique()} machines, {len(results)} items")
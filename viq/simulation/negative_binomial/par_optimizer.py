@@ -0,0 +1,142 @@
+# par_optimizer.py
+
+import numpy as np
+import pandas as pd
+
+
+class ParOptimizer:
+    """
+    Availability for every candidate par level from one set of simulated
+    cycle demands per item.
+
+    The empirical CDF of each item's cycle demand is built once; the
+    availability of a par P then follows from the same stochastic-rounded
+    effective inventory as AssetSimulation._effective_inventory:
+    x = P - avg_daily_sales * lead_time_days.
+    """
+
+    def __init__(
+        self,
+        item_names,
+        cycle_totals,
+        avg_daily_sales,
+        lead_time_days,
+        capacities=None
+    ):
+        # (items x sims); a single item's samples are accepted as 1-D
+        self.cycle_totals = np.atleast_2d(np.asarray(cycle_totals, dtype=np.int64))
+        self.item_names = np.atleast_1d(np.asarray(item_names, dtype=object))
+        self.avg_daily_sales = np.atleast_1d(np.asarray(avg_daily_sales, dtype=float))
+        self.lead_time_days = lead_time_days
+
+        n_items = len(self.item_names)
+        if capacities is None:
+            self.capacities = np.full(n_items, np.nan)
+        else:
+            self.capacities = np.atleast_1d(np.asarray(capacities, dtype=float))
+
+        self._tail = self._demand_tail()
+
+    @classmethod
+    def from_machine_simulation(cls, sim):
+        if sim.cycle_totals is None:
+            raise ValueError("Simulation has not been run. Call run() first.")
+
+        return cls(
+            item_names=sim.item_names,
+            cycle_totals=sim.cycle_totals,
+            avg_daily_sales=sim.avg_daily_sales,
+            lead_time_days=sim.lead_time_days,
+            capacities=sim.capacities
+        )
+
+    def _demand_tail(self):
+        # P(cycle demand > k) for k = 0..max demand, plus a trailing 0
+        n_items, sims = self.cycle_totals.shape
+        width = int(self.cycle_totals.max(initial=0)) + 1
+
+        # One bincount for all items: offset each row into its own block
+        offsets = np.arange(n_items)[:, None] * width
+        counts = np.bincount(
+            (self.cycle_totals + offsets).ravel(),
+            minlength=n_items * width
+        ).reshape(n_items, width)
+
+        tail = 1 - np.cumsum(counts, axis=1) / sims
+        return np.hstack([np.clip(tail, 0, 1), np.zeros((n_items, 1))])
+
+    def _default_max_par(self):
+        demand_cover = self._tail.shape[1] + np.ceil(
+            self.avg_daily_sales.max(initial=0) * self.lead_time_days
+        )
+        return int(np.nanmax(np.append(self.capacities, demand_cover)))
+
+    def stockout_matrix(self, par_levels):
+        """
+        (items x pars) stockout probabilities for the given par levels.
+        """
+        par_levels = np.asarray(par_levels, dtype=float)
+
+        x = par_levels[None, :] - (self.avg_daily_sales * self.lead_time_days)[:, None]
+        x = np.maximum(x, 0)
+
+        base = np.floor(x)
+        frac = x - base
+
+        last = self._tail.shape[1] - 1
+        lower = np.minimum(base, last).astype(int)
+        upper = np.minimum(base + 1, last).astype(int)
+
+        return (
+            (1 - frac) * np.take_along_axis(self._tail, lower, axis=1)
+            + frac * np.take_along_axis(self._tail, upper, axis=1)
+        )
+
+    def availability_curve(self, max_par=None):
+        """
+        Long table of item_name, par_level, availability for every par
+        from 0 to max_par.
+        """
+        if max_par is None:
+            max_par = self._default_max_par()
+
+        par_levels = np.arange(max_par + 1)
+        availability = 1 - self.stockout_matrix(par_levels)
+
+        return pd.DataFrame({
+            "item_name": np.repeat(self.item_names, len(par_levels)),
+            "par_level": np.tile(par_levels, len(self.item_names)),
+            "availability": availability.ravel()
+        })
+
+    def recommend(self, target_availability=0.95, max_par=None):
+        """
+        Minimum par per item meeting target_availability, capped by
+        capacity. Items that cannot meet the target within capacity get
+        their capacity and target_met=False.
+        """
+        if max_par is None:
+            max_par = self._default_max_par()
+
+        par_levels = np.arange(max_par + 1)
+        availability = 1 - self.stockout_matrix(par_levels)
+
+        cap = np.where(
+            np.isnan(self.capacities),
+            max_par,
+            np.minimum(self.capacities, max_par)
+        ).astype(int)
+
+        allowed = par_levels[None, :] <= cap[:, None]
+        meets = (availability >= target_availability) & allowed
+
+        target_met = meets.any(axis=1)
+        recommended = np.where(target_met, meets.argmax(axis=1), cap)
+
+        return pd.DataFrame({
+            "item_name": self.item_names,
+            "recommended_par": recommended,
+            "availability": availability[np.arange(len(recommended)), recommended],
+            "capacity": self.capacities,
+            "target_met": target_met
+        })
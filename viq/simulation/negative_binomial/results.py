@@ -0,0 +1,167 @@
+# results.py
+
+import numpy as np
+import pandas as pd
+
+
+SUMMARY_FIELDS = (
+    "item_name",
+    "avg_daily_sales",
+    "daily_std",
+    "p95_cycle_demand",
+    "avg_cycle_demand",
+    "effective_inventory",
+    "availability",
+    "stockout_probability",
+    "current_par_level"
+)
+
+# Set only by run_adaptive() / analytic(cross_check=True)
+OPTIONAL_FIELDS = (
+    "stockout_ci_low",
+    "stockout_ci_high",
+    "simulations_used",
+    "simulated_p95_cycle_demand",
+    "simulated_stockout_probability"
+)
+
+SAMPLE_FIELDS = ("simulated_sales", "histogram")
+
+
+class AssetSimulationResult:
+    """
+    Result of one AssetSimulation run.
+
+    simulated_sales is kept as an int32 NumPy array, or replaced by
+    `histogram` (counts per cycle demand 0..max) when only the
+    distribution is needed. Supports result["key"], .get(), `in` and
+    .keys() for code written against the old dict results; the optional
+    fields and the samples only count as keys once set. to_dict() leaves
+    the samples out.
+    """
+
+    __slots__ = SUMMARY_FIELDS + OPTIONAL_FIELDS + SAMPLE_FIELDS
+
+    def __init__(self, simulated_sales=None, histogram=None, **summary):
+        for field in SUMMARY_FIELDS:
+            setattr(self, field, summary[field])
+
+        for field in OPTIONAL_FIELDS:
+            setattr(self, field, summary.get(field))
+
+        self.simulated_sales = simulated_sales
+        self.histogram = histogram
+
+    def keys(self):
+        return [
+            field for field in self.__slots__
+            if field in SUMMARY_FIELDS or getattr(self, field) is not None
+        ]
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __getitem__(self, key):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def to_dict(self):
+        return {
+            field: getattr(self, field)
+            for field in self.keys()
+            if field not in SAMPLE_FIELDS
+        }
+
+    def __repr__(self):
+        return f"AssetSimulationResult({self.to_dict()})"
+
+
+class SimulationResults:
+    """
+    Results for a batch of items: summary columns as arrays plus the
+    (items x sims) cycle demand matrix.
+    """
+
+    __slots__ = SUMMARY_FIELDS + ("simulated_sales",)
+
+    def __init__(self, simulated_sales, **summary):
+        for field in SUMMARY_FIELDS:
+            setattr(self, field, np.asarray(summary[field]))
+
+        self.simulated_sales = simulated_sales
+
+    @classmethod
+    def from_results(cls, results):
+        """
+        Stacks single-item results with equal sample counts.
+        """
+        return cls(
+            simulated_sales=np.stack([r.simulated_sales for r in results]),
+            **{
+                field: [getattr(r, field) for r in results]
+                for field in SUMMARY_FIELDS
+            }
+        )
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {field: getattr(self, field) for field in SUMMARY_FIELDS}
+        )
+
+    def quantile_summary(self) -> pd.DataFrame:
+        """
+        Box plot statistics per item from the sample matrix: quartiles,
+        whiskers (furthest samples within 1.5 IQR), p95, stockout
+        probability and par. O(items) rows for SimulationRiskBoxPlot.
+        Stockout Probability is P(cycle demand > par), as in the box plot's
+        raw mode; the lead-time aware figure stays in stockout_probability.
+        """
+        samples = self.simulated_sales
+        q1, median, q3, p95 = np.quantile(samples, [0.25, 0.5, 0.75, 0.95], axis=1)
+
+        iqr = q3 - q1
+        lower = samples.min(
+            axis=1, initial=np.iinfo(samples.dtype).max,
+            where=samples >= (q1 - 1.5 * iqr)[:, None]
+        )
+        upper = samples.max(
+            axis=1, initial=np.iinfo(samples.dtype).min,
+            where=samples <= (q3 + 1.5 * iqr)[:, None]
+        )
+
+        return pd.DataFrame({
+            "Item Name": self.item_name,
+            "q1": q1,
+            "median": median,
+            "q3": q3,
+            "lower_fence": lower,
+            "upper_fence": upper,
+            "p95": p95,
+            "Stockout Probability": (
+                samples > np.asarray(self.current_par_level)[:, None]
+            ).mean(axis=1),
+            "Par Level": self.current_par_level
+        })
+
+    def samples_frame(self) -> pd.DataFrame:
+        """
+        Long table of Item Name, Simulation, Cycle Demand. Cycle Demand
+        is a view of the sample matrix, not a copy.
+        """
+        n_items, sims = self.simulated_sales.shape
+
+        return pd.DataFrame(
+            {
+                "Item Name": pd.Categorical.from_codes(
+                    np.repeat(np.arange(n_items, dtype=np.int32), sims),
+                    categories=self.item_name
+                ),
+                "Simulation": np.tile(np.arange(1, sims + 1, dtype=np.int32), n_items),
+                "Cycle Demand": self.simulated_sales.reshape(-1)
+            },
+            copy=False
+        )
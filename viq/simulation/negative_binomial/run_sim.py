@@ -1,9 +1,12 @@
 # run_sim.py
+# From the repo root: python -m viq.simulation.negative_binomial.run_sim
 
 import pandas as pd
 
-from asset_sim import AssetSimulation
-from stats_utils import get_month_columns, daily_stats_since_launch
+from viq.Load.cache import read_excel_cached
+from viq.simulation.negative_binomial.machine_sim import MachineSimulation, machine_item_table
+from viq.simulation.negative_binomial.par_optimizer import ParOptimizer
+from viq.simulation.negative_binomial.sales_export import SimulatedSalesWriter
 
 
 # -----------------------------
@@ -21,77 +24,50 @@ if __name__ == "__main__":
     DAYS_BETWEEN_VISITS = 20
     LEAD_TIME_DAYS = 2
     SIMS = 10_000
-
-    df_main = pd.read_excel("/Users/andrewleacock1/Downloads/14438.xlsx", header=12)
-    df_par =  pd.read_excel("/Users/andrewleacock1/Downloads/14438_par.xlsx", header=12)
-
-    month_columns = get_month_columns(df_main)
-
-    if "Vending Par Level" in df_par.columns:
-        par_col = "Vending Par Level"
-    elif "MM Par" in df_par.columns:
-        par_col = "MM Par"
-    else:
-        raise ValueError("Missing par column")
-
-    if "Capacity" not in df_par.columns:
-        raise ValueError("Missing Capacity column")
-
-    par_lookup = df_par.set_index("Item Name")[par_col]
-    capacity_lookup = df_par.set_index("Item Name")["Capacity"]
-
-    results = []
-    sales_rows = []
-
-    for _, row in df_main.iterrows():
-        item = row["Item Name"]
-
-        if item not in par_lookup:
-            continue
-
-        mean, std = daily_stats_since_launch(
-            row,
-            month_columns,
-            DAYS_PER_MONTH
-        )
-
-        if mean <= 0:
-            continue
-
-        sim = AssetSimulation(
-            item_name=item,
-            avg_daily_sales=mean,
-            daily_std=std,
-            days_between_visits=DAYS_BETWEEN_VISITS,
-            lead_time_days=LEAD_TIME_DAYS,
-            par_level=int(par_lookup[item]),
-            number_of_simulations=SIMS
-        )
-
-        result = sim.run()
-        results.append(result)
-
-        for i, demand in enumerate(result["simulated_sales"]):
-            sales_rows.append({
-                "Item Name": item,
-                "Simulation": i + 1,
-                "Cycle Demand": demand,
-                "Par Level": result["current_par_level"],
-                "Avg Daily Sales": result["avg_daily_sales"],
-                "Daily Std": result["daily_std"]
-            })
+    SEED = 42
+    TARGET_AVAILABILITY = 0.95
+
+    # e.g. "/Users/andrewleacock1/Downloads/simulated_sales_14438.parquet"
+    EXPORT_PATH = None
+
+    df_main = read_excel_cached("/Users/andrewleacock1/Downloads/14438.xlsx", header=12)
+    df_par =  read_excel_cached("/Users/andrewleacock1/Downloads/14438_par.xlsx", header=12)
+
+    items = machine_item_table(df_main, df_par, DAYS_PER_MONTH)
+
+    # ONE CALL FOR THE WHOLE MACHINE
+    sim = MachineSimulation(
+        item_names=items["Item Name"].values,
+        avg_daily_sales=items["avg_daily_sales"].values,
+        daily_std=items["daily_std"].values,
+        par_levels=items["par_level"].values,
+        capacities=items["capacity"].values,
+        days_between_visits=DAYS_BETWEEN_VISITS,
+        lead_time_days=LEAD_TIME_DAYS,
+        number_of_simulations=SIMS,
+        rng=SEED
+    )
+
+    df_results = sim.run()
+
+    # Min par hitting the target from the same samples, capped by capacity
+    recommended = ParOptimizer.from_machine_simulation(sim).recommend(
+        TARGET_AVAILABILITY
+    )
+    df_results["recommended_par"] = recommended["recommended_par"].values
+    results = df_results.to_dict("records")
 
     # -----------------------------
     # PRINT SUMMARY WITH FLAGS
     # -----------------------------
     for r in results:
         item = r["item_name"]
-        capacity = capacity_lookup.get(item)
+        capacity = r["capacity"]
         par = r["current_par_level"]
 
         color = RESET
 
-        if capacity is not None:
+        if pd.notna(capacity):
             # RED: avg demand physically exceeds capacity
             if r["avg_cycle_demand"] > capacity:
                 color = RED
@@ -115,6 +91,7 @@ if __name__ == "__main__":
         print(f"Avg Cycle Demand:     {r['avg_cycle_demand']}")
         print(f"P95 Cycle Demand:     {r['p95_cycle_demand']}")
         print(f"Current Par Level:   {par}")
+        print(f"Recommended Par:     {r['recommended_par']}")
         print(f"Capacity:             {capacity}")
         print(f"Effective Inventory: {r['effective_inventory']}")
         print(f"Availability:        {r['availability']:.2%}")
@@ -124,9 +101,6 @@ if __name__ == "__main__":
     # -----------------------------
     # EXPORT SIMULATED SALES
     # -----------------------------
-    # df_sales = pd.DataFrame(sales_rows)
-
-    # df_sales.to_csv(
-    #     "/Users/andrewleacock1/Downloads/simulated_sales_255.csv",
-    #     index=False
-    # )
+    if EXPORT_PATH is not None:
+        with SimulatedSalesWriter(EXPORT_PATH) as writer:
+            writer.write_machine(sim)
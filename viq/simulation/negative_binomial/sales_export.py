@@ -0,0 +1,124 @@
+# sales_export.py
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+SIMULATED_SALES_SCHEMA = pa.schema([
+    ("Item Name", pa.dictionary(pa.int32(), pa.string())),
+    ("Simulation", pa.int32()),
+    ("Cycle Demand", pa.int32()),
+    ("Par Level", pa.int32()),
+    ("Avg Daily Sales", pa.float32()),
+    ("Daily Std", pa.float32())
+])
+
+
+class SimulatedSalesWriter:
+    """
+    Streams simulated cycle demand to a parquet file, one item at a time.
+
+    Every item is written as its own row group(s), so readers can load a
+    single item without touching the rest of the file. Item names are
+    dictionary encoded and the per-item columns compress to almost
+    nothing, so memory stays at one chunk regardless of machine size.
+    """
+
+    def __init__(self, path, chunk_size=65_536):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._writer = pq.ParquetWriter(path, SIMULATED_SALES_SCHEMA)
+
+    def write_item(
+        self,
+        item_name,
+        simulated_sales,
+        par_level,
+        avg_daily_sales,
+        daily_std
+    ):
+        simulated_sales = np.asarray(simulated_sales, dtype=np.int32)
+
+        for start in range(0, len(simulated_sales), self.chunk_size):
+            chunk = simulated_sales[start:start + self.chunk_size]
+            n = len(chunk)
+
+            table = pa.table(
+                {
+                    "Item Name": pa.DictionaryArray.from_arrays(
+                        pa.array(np.zeros(n, dtype=np.int32)),
+                        pa.array([item_name], type=pa.string())
+                    ),
+                    "Simulation": pa.array(
+                        np.arange(start + 1, start + n + 1, dtype=np.int32)
+                    ),
+                    "Cycle Demand": pa.array(chunk),
+                    "Par Level": pa.array(np.full(n, par_level, dtype=np.int32)),
+                    "Avg Daily Sales": pa.array(
+                        np.full(n, avg_daily_sales, dtype=np.float32)
+                    ),
+                    "Daily Std": pa.array(np.full(n, daily_std, dtype=np.float32))
+                },
+                schema=SIMULATED_SALES_SCHEMA
+            )
+
+            self._writer.write_table(table, row_group_size=self.chunk_size)
+
+    def write_machine(self, sim):
+        """
+        Writes every item of a MachineSimulation that has been run.
+        """
+        if sim.cycle_totals is None:
+            raise ValueError("Simulation has not been run. Call run() first.")
+
+        for i in range(sim.n_items):
+            self.write_item(
+                item_name=sim.item_names[i],
+                simulated_sales=sim.cycle_totals[i],
+                par_level=sim.par_levels[i],
+                avg_daily_sales=round(sim.avg_daily_sales[i], 4),
+                daily_std=round(sim.daily_std[i], 4)
+            )
+
+    def close(self):
+        self._writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def read_simulated_sales(path, items=None):
+    """
+    Reads the export back as a DataFrame (Item Name as categorical),
+    optionally only for the given items.
+    """
+    filters = [("Item Name", "in", list(items))] if items is not None else None
+    return pq.read_table(path, filters=filters).to_pandas()
+
+
+def iter_simulated_sales(path):
+    """
+    Lazily yields (item_name, DataFrame) one item at a time.
+    """
+    parquet_file = pq.ParquetFile(path)
+
+    current_item = None
+    pending = []
+
+    for i in range(parquet_file.num_row_groups):
+        table = parquet_file.read_row_group(i)
+        item = table.column("Item Name")[0].as_py()
+
+        if pending and item != current_item:
+            yield current_item, pa.concat_tables(pending).to_pandas()
+            pending = []
+
+        current_item = item
+        pending.append(table)
+
+    if pending:
+        yield current_item, pa.concat_tables(pending).to_pandas()
@@ -1,8 +1,10 @@
 import math
-import re
+
 import numpy as np
 import pandas as pd
 
+from viq.Load.cache import read_excel_cached
+from viq.analysis.stats import get_month_columns, daily_stats_table, wilson_interval
 from viq.simulation.poisson.daily_demand import DailyDemand
 
 
@@ -17,7 +19,8 @@ class ItemRestockingMonteCarlo:
         days_between_visits,
         lead_time_days,
         par_level,
-        number_of_simulations
+        number_of_simulations,
+        rng=None
     ):
         self.item_name = item_name
         self.average_daily_sales = average_daily_sales
@@ -25,7 +28,8 @@ class ItemRestockingMonteCarlo:
         self.lead_time_days = lead_time_days
         self.par_level = par_level
         self.number_of_simulations = number_of_simulations
-        self.daily_demand = DailyDemand(average_daily_sales)
+        self.rng = np.random.default_rng(rng)
+        self.daily_demand = DailyDemand(average_daily_sales, rng=self.rng)
 
     def __on_hand__(self):
         return max(
@@ -50,14 +54,107 @@ class ItemRestockingMonteCarlo:
             if total_units_sold > inventory_at_start:
                 stockouts += 1
 
+        return self._summarize(cycle_totals, stockouts, inventory_at_start)
+
+    def sim_vectorized(self):
+        inventory_at_start = self.__on_hand__()
+
+        # (simulations,) cycle totals in one NumPy call
+        cycle_totals = self.daily_demand._cycle_units_sold_(
+            self.days_between_visits,
+            self.number_of_simulations
+        )
+
+        stockouts = int(np.count_nonzero(cycle_totals > inventory_at_start))
+
+        return self._summarize(cycle_totals, stockouts, inventory_at_start)
+
+    def sim_adaptive(
+        self,
+        target_half_width=0.005,
+        batch_size=1_000,
+        max_simulations=None,
+        confidence=0.95
+    ):
+        # Draw batches until the stockout-probability CI is tight enough
+        if max_simulations is None:
+            max_simulations = 10 * self.number_of_simulations
+
+        inventory_at_start = self.__on_hand__()
+        batches = []
+        stockouts = 0
+        n = 0
+
+        while True:
+            size = min(batch_size, max_simulations - n)
+            cycle_totals = self.daily_demand._cycle_units_sold_(
+                self.days_between_visits,
+                size
+            )
+
+            batches.append(cycle_totals)
+            stockouts += int(np.count_nonzero(cycle_totals > inventory_at_start))
+            n += size
+
+            low, high = wilson_interval(stockouts, n, confidence)
+            if (high - low) / 2 <= target_half_width or n >= max_simulations:
+                break
+
+        result = self._summarize(
+            np.concatenate(batches),
+            stockouts,
+            inventory_at_start
+        )
+        result["stockout_ci_low"] = low
+        result["stockout_ci_high"] = high
+        result["simulations_used"] = n
+
+        return result
+
+    def analytic(self, cross_check=False):
+        # Cycle demand is Poisson(avg * days); read everything off its CDF
+        inventory_at_start = self.__on_hand__()
+        cdf = np.cumsum(
+            self.daily_demand._cycle_pmf_(self.days_between_visits)
+        )
+
+        k = math.floor(inventory_at_start)
+        stockout_probability = (
+            float(max(1 - cdf[k], 0.0)) if k < len(cdf) else 0.0
+        )
+
+        result = {
+            "item_name": self.item_name,
+            "avg_daily_sales_used": round(self.average_daily_sales, 4),
+            "p95_cycle_demand": float(np.searchsorted(cdf, 0.95)),
+            "average_cycle_demand": int(
+                self.average_daily_sales * self.days_between_visits
+            ),
+            "effective_inventory": k,
+            "availability": 1 - stockout_probability,
+            "stockout_probability": stockout_probability,
+            "current_par_level": self.par_level
+        }
+
+        if cross_check:
+            simulated = self.sim_vectorized()
+            result["simulated_p95_cycle_demand"] = simulated["p95_cycle_demand"]
+            result["simulated_stockout_probability"] = (
+                simulated["stockout_probability"]
+            )
+
+        return result
+
+    def _summarize(self, cycle_totals, stockouts, inventory_at_start):
+        n = len(cycle_totals)
         return {
             "item_name": self.item_name,
             "avg_daily_sales_used": round(self.average_daily_sales, 4),
             "p95_cycle_demand": float(np.percentile(cycle_totals, 95)),
             "average_cycle_demand": int(np.mean(cycle_totals)),
             "effective_inventory": math.floor(inventory_at_start),
-            "availability": 1 - (stockouts / self.number_of_simulations),
-            "stockout_probability": stockouts / self.number_of_simulations,
+            "availability": 1 - (stockouts / n),
+            "stockout_probability": stockouts / n,
             "current_par_level": self.par_level
         }
 
@@ -65,32 +162,11 @@ class ItemRestockingMonteCarlo:
 # -----------------------------
 # HELPERS
 # -----------------------------
-def get_month_columns(df):
-    pattern = re.compile(r"^\d{2}/\d{4}$")
-    return [c for c in df.columns if pattern.match(str(c))]
-
-
 def compute_avg_daily_sales_after_first_sale(row, month_columns, days_per_month):
-    monthly_sales = (
-        pd.to_numeric(row[month_columns], errors="coerce")
-        .fillna(0.0)
-        .values
-    )
-
-    first_sale_idx = None
-    for i, val in enumerate(monthly_sales):
-        if val > 0:
-            first_sale_idx = i
-            break
-
-    if first_sale_idx is None:
-        return 0.0
-
-    valid_sales = monthly_sales[first_sale_idx:]
-    total_units = valid_sales.sum()
-    total_days = len(valid_sales) * days_per_month
-
-    return total_units / total_days
+    # Single-row view of daily_stats_table; prefer the table for many rows
+    return daily_stats_table(
+        row.to_frame().T, month_columns, days_per_month
+    )["avg_daily_sales"].iloc[0]
 
 
 def display_results(results):
@@ -119,15 +195,16 @@ if __name__ == "__main__":
     DAYS_BETWEEN_VISITS = 3
     LEAD_TIME_DAYS = 2
     SIMS = 10_000
+    SEED = 42
 
     # -----------------------------
     # LOAD DATA (YOUR PATHS)
     # -----------------------------
-    df_main = pd.read_excel(
+    df_main = read_excel_cached(
         "/Users/andrewleacock1/Downloads/276.xlsx"
     )
 
-    df_par = pd.read_excel(
+    df_par = read_excel_cached(
         "/Users/andrewleacock1/Downloads/276_par.xlsx"
     )
 
@@ -158,35 +235,31 @@ if __name__ == "__main__":
     # -----------------------------
     # RUN SIMS (ONLY ITEMS IN MACHINE)
     # -----------------------------
-    results = []
-
-    for _, row in df_main.iterrows():
-
-        item_name = row["Item Name"]
+    stats = daily_stats_table(df_main, month_columns, DAYS_PER_MONTH)
 
-        # NOT IN PAR FILE -> NOT IN MACHINE
-        if item_name not in par_lookup:
-            continue
-
-        avg_daily_sales = compute_avg_daily_sales_after_first_sale(
-            row=row,
-            month_columns=month_columns,
-            days_per_month=DAYS_PER_MONTH
-        )
+    in_machine = (
+        df_main["Item Name"].isin(par_lookup.index)
+        & (stats["avg_daily_sales"] > 0)
+    )
 
-        if avg_daily_sales <= 0:
-            continue
+    rng = np.random.default_rng(SEED)
+    results = []
 
+    for item_name, avg_daily_sales in zip(
+        df_main.loc[in_machine, "Item Name"],
+        stats.loc[in_machine, "avg_daily_sales"]
+    ):
         mc = ItemRestockingMonteCarlo(
             item_name=item_name,
             average_daily_sales=avg_daily_sales,
             days_between_visits=DAYS_BETWEEN_VISITS,
             lead_time_days=LEAD_TIME_DAYS,
             par_level=int(par_lookup[item_name]),
-            number_of_simulations=SIMS
+            number_of_simulations=SIMS,
+            rng=rng
         )
 
-        results.append(mc.sim())
+        results.append(mc.sim_vectorized())
 
     # -----------------------------
     # OUTPUT
@@ -1,12 +1,15 @@
 import math
-import random
+
+import numpy as np
 
 '''Module to simulate daily demand using a Poisson distribution.'''
 
 
 class DailyDemand:
-    def __init__(self, average_daily_sales):
+    def __init__(self, average_daily_sales, rng=None):
         self.average_daily_sales = average_daily_sales
+        # Seed or Generator; ItemRestockingMonteCarlo passes its own
+        self.rng = np.random.default_rng(rng)
 
     def _units_sold_(self):
         cutoff_value = math.exp(-self.average_daily_sales)
@@ -15,13 +18,30 @@ class DailyDemand:
 
         while random_product > cutoff_value:
             units_sold_today += 1
-            random_product *= random.random()
+            random_product *= self.rng.random()
 
         return units_sold_today - 1
 
+    def _cycle_units_sold_(self, days, size):
+        # A sum of i.i.d. Poisson days is Poisson(avg * days), so a whole
+        # cycle is one draw per simulation instead of one per day.
+        return self.rng.poisson(self.average_daily_sales * days, size=size)
+
+    def _cycle_pmf_(self, days):
+        # Exact pmf of Poisson(avg * days) over 0..k_max, built in log space
+        lam = self.average_daily_sales * days
+        if lam <= 0:
+            return np.ones(1)
+
+        k_max = int(math.ceil(lam + 12 * math.sqrt(lam) + 20))
+        k = np.arange(k_max + 1)
+        log_factorial = np.concatenate(([0.0], np.cumsum(np.log(k[1:]))))
+
+        return np.exp(k * math.log(lam) - lam - log_factorial)
+
 
 if __name__ == "__main__":
-    daily_demand = DailyDemand(average_daily_sales=2.6)
+    daily_demand = DailyDemand(average_daily_sales=2.6, rng=42)
     print([daily_demand._units_sold_() for _ in range(365)])
 
 